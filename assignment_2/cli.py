@@ -0,0 +1,236 @@
+"""Headless command line interface for batch sweeps.
+
+Usage:
+    assignment2 run job.toml [--shard i/N] [--workers W] [--memory-budget MB]
+        [--artifact]
+    assignment2 compile job.toml
+    assignment2 merge job.toml
+"""
+
+import argparse
+import math
+from pathlib import Path
+
+from tqdm import tqdm
+
+from assignment_2.utils.job import Job, shard_points, solve_artifact_points
+from assignment_2.utils.sweep_writer import SweepReader, SweepWriter
+
+
+def _parse_shard(shard: str) -> tuple[int, int]:
+    """Parse a shard given as ``i/N``.
+
+    Args:
+        shard (str): Zero-based shard index and number of shards.
+
+    Returns:
+        tuple[int, int]: Shard index and number of shards.
+    """
+    try:
+        index, count = (int(value) for value in shard.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Shard must be given as i/N, got {shard}."
+        ) from None
+    return index, count
+
+
+def shard_directory(job: Job, index: int, count: int) -> Path:
+    """Get the result directory of a shard.
+
+    Args:
+        job (Job): Sweep job.
+        index (int): Index of the shard.
+        count (int): Number of shards.
+
+    Returns:
+        Path: Result directory of the shard.
+    """
+    return job.output / f"shard_{index}_of_{count}"
+
+
+def artifact_directory(job: Job) -> Path:
+    """Get the directory of the compiled model of a job.
+
+    Args:
+        job (Job): Sweep job.
+
+    Returns:
+        Path: Directory of the artifact.
+    """
+    return job.output / "artifact"
+
+
+def run(
+    job: Job,
+    index: int = 0,
+    count: int = 1,
+    quiet: bool = False,
+    workers: int = 1,
+    memory_budget: float | None = None,
+    artifact: bool = False,
+) -> None:
+    """Solve the points of a shard, skipping points solved by an earlier run.
+
+    Args:
+        job (Job): Sweep job.
+        index (int, optional): Index of the shard. Defaults to 0.
+        count (int, optional): Number of shards. Defaults to 1.
+        quiet (bool, optional): Hide the progress bar. Defaults to False.
+        workers (int, optional): Number of worker processes. Defaults to 1.
+        memory_budget (float | None, optional): Memory available to the workers
+            in MB. Points are delayed or downsized to stay within it. Defaults
+            to None, i.e. no limit, and with a single worker all points are
+            solved on one model in this process.
+        artifact (bool, optional): Solve the points on the compiled model of the
+            job, compiled first if missing, instead of rebuilding the model for
+            every point. Defaults to False.
+    """
+    if artifact and memory_budget is not None:
+        raise Exception("A memory budget cannot be used with a compiled model.")
+
+    points = shard_points(job.points(), index, count)
+    with SweepWriter(shard_directory(job, index, count)) as writer:
+        points = [
+            (str(grid_index), point)
+            for grid_index, point in points
+            if not writer.is_done(str(grid_index))
+        ]
+        if artifact:
+            from assignment_2.model2.artifact import INDEX_FILE
+
+            directory = artifact_directory(job)
+            if not (directory / INDEX_FILE).exists():
+                job.compile_artifact(directory)
+            for point_id, result in tqdm(
+                solve_artifact_points(job, directory, points, workers),
+                total=len(points),
+                disable=quiet,
+            ):
+                writer.write(point_id, result)
+            return
+
+        if workers <= 1 and memory_budget is None:
+            model = job.create_model()
+            for point_id, point in tqdm(points, disable=quiet):
+                writer.write(point_id, job.solve_point(model, point))
+            return
+
+        from assignment_2.utils.memory import MemoryBudgetRunner, MemoryEstimator
+
+        calibration = job.output / "memory_calibration.json"
+        runner = MemoryBudgetRunner(
+            job,
+            budget=math.inf if memory_budget is None else memory_budget * 1024**2,
+            max_workers=workers,
+            estimator=MemoryEstimator.load(calibration),
+        )
+        for point_id, result in tqdm(
+            runner.run(points), total=len(points), disable=quiet
+        ):
+            if result is not None:
+                writer.write(point_id, result)
+        runner.estimator.save(calibration)
+
+
+def merge(job: Job) -> Path:
+    """Combine the shard results of a job into a single sweep directory.
+
+    Args:
+        job (Job): Sweep job.
+
+    Returns:
+        Path: Directory of the merged results.
+    """
+    merged_directory = job.output / "merged"
+    n_points = len(job.points())
+    with SweepWriter(merged_directory, chunk_size=10_000) as writer:
+        for directory in sorted(job.output.glob("shard_*_of_*")):
+            reader = SweepReader(directory)
+            for chunk in reader.iter_chunks():
+                for i, point_id in enumerate(chunk["point_id"]):
+                    if writer.is_done(str(point_id)):
+                        continue
+                    writer.write(
+                        str(point_id),
+                        {column: float(chunk[column][i]) for column in reader.columns},
+                    )
+        n_merged = len(writer.completed)
+
+    if n_merged < n_points:
+        print(f"Warning: {n_points - n_merged} of {n_points} points are missing.")
+    return merged_directory
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the command line interface.
+
+    Args:
+        argv (list[str] | None, optional): Command line arguments. Defaults to
+            None, which reads ``sys.argv``.
+    """
+    parser = argparse.ArgumentParser(
+        prog="assignment2", description="Run model sweeps described by job files."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Solve the sweep grid of a job.")
+    run_parser.add_argument("job", type=Path, help="Job TOML file.")
+    run_parser.add_argument(
+        "--shard",
+        type=_parse_shard,
+        default=(0, 1),
+        help="Solve only shard i of N (zero-based), e.g. 0/4.",
+    )
+    run_parser.add_argument(
+        "--workers", type=int, default=1, help="Number of worker processes."
+    )
+    run_parser.add_argument(
+        "--memory-budget",
+        type=float,
+        default=None,
+        help="Memory in MB available to the workers. Larger points are delayed, "
+        "run in lean mode or with fewer scenarios.",
+    )
+    run_parser.add_argument(
+        "--artifact",
+        action="store_true",
+        help="Solve the points on the compiled model of the job, compiling it "
+        "first if missing.",
+    )
+    run_parser.add_argument(
+        "--quiet", action="store_true", help="Hide the progress bar."
+    )
+
+    compile_parser = subparsers.add_parser(
+        "compile", help="Build the model of a job once and save it for the workers."
+    )
+    compile_parser.add_argument("job", type=Path, help="Job TOML file.")
+
+    merge_parser = subparsers.add_parser(
+        "merge", help="Combine the shard results of a job."
+    )
+    merge_parser.add_argument("job", type=Path, help="Job TOML file.")
+
+    args = parser.parse_args(argv)
+    job = Job.from_toml(args.job)
+    if args.command == "run":
+        index, count = args.shard
+        run(
+            job,
+            index=index,
+            count=count,
+            quiet=args.quiet,
+            workers=args.workers,
+            memory_budget=args.memory_budget,
+            artifact=args.artifact,
+        )
+    elif args.command == "compile":
+        directory = job.compile_artifact(artifact_directory(job))
+        print(f"Compiled model written to {directory}")
+    elif args.command == "merge":
+        print(f"Merged results written to {merge(job)}")
+
+
+if __name__ == "__main__":
+    main()
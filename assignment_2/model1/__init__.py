@@ -1,8 +1,25 @@
-"""Initialization file for model1 package."""
+"""Initialization file for model1 package.
 
-from assignment_2.model1.data import DataModel1
-from assignment_2.model1.lcoe_model import (
-    LCOEModel,
-)
+Public names are imported on first access so that gurobipy is only loaded
+when a model is used.
+"""
+
+from typing import TYPE_CHECKING
+
+from assignment_2.utils.lazy import lazy_getattr
+
+if TYPE_CHECKING:
+    from assignment_2.model1.data import DataModel1
+    from assignment_2.model1.lcoe_model import (
+        LCOEModel,
+    )
 
 __all__ = ["DataModel1", "LCOEModel"]
+
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "DataModel1": "assignment_2.model1.data",
+        "LCOEModel": "assignment_2.model1.lcoe_model",
+    },
+)
@@ -1,15 +1,23 @@
 """Implementation of optimization model 1."""
 
-from gurobipy import GRB, Model, quicksum
+from gurobipy import GRB, Env, quicksum
 
 from assignment_2.model1.data import DataModel1
+from assignment_2.utils.gurobi_env import EnvPool, GurobiModel
 
 
-class LCOEModel:
+class LCOEModel(GurobiModel):
     """Optimization model minimizing system LCOE."""
 
-    def __init__(self) -> None:
-        """Initialize instance."""
+    def __init__(self, env: Env | EnvPool | None = None) -> None:
+        """Initialize instance.
+
+        Args:
+            env (Env | EnvPool | None, optional): Environment, or pool of
+                environments, for the Gurobi model. Defaults to None, i.e. the
+                environment shared within the process.
+        """
+        super().__init__(env)
 
     def define_model(self, data: DataModel1) -> None:
         """Define the optimization model and its parameters.
@@ -18,8 +26,7 @@ class LCOEModel:
             data (DataModel1): Data for the optimization model.
         """
         # Create gurobi model
-        self.model = Model("Model1")
-        self.model.setParam("OutputFlag", 0)
+        self.new_model("Model1")
         self.gen_names = data.gen_names
         self.colors = data.colors
 
@@ -1,8 +1,25 @@
-"""Initialization file for model2 package."""
+"""Initialization file for model2 package.
 
-from assignment_2.model2.data import DataModel
-from assignment_2.model2.intertemporal_expansion_model import (
-    IntertemporalExpansionModel,
-)
+Public names are imported on first access so that gurobipy is only loaded
+when a model is used.
+"""
+
+from typing import TYPE_CHECKING
+
+from assignment_2.utils.lazy import lazy_getattr
+
+if TYPE_CHECKING:
+    from assignment_2.model2.data import DataModel
+    from assignment_2.model2.intertemporal_expansion_model import (
+        IntertemporalExpansionModel,
+    )
 
 __all__ = ["DataModel", "IntertemporalExpansionModel"]
+
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "DataModel": "assignment_2.model2.data",
+        "IntertemporalExpansionModel": "assignment_2.model2.intertemporal_expansion_model",
+    },
+)
@@ -0,0 +1,67 @@
+"""Model data of the expansion models as NumPy arrays.
+
+Shared by the matrix form and the audit. Only needs NumPy, so the audit works
+without the optional SciPy dependency of the matrix form.
+"""
+
+import numpy as np
+
+from assignment_2.model2.data import DataModel
+
+
+def scenario_arrays(
+    data: DataModel, uncertainty: bool = False
+) -> dict[str, np.ndarray | float]:
+    """Collect the model data as arrays.
+
+    Args:
+        data (DataModel): Data for the optimization model.
+        uncertainty (bool, optional): Include all uncertainty scenarios as done by
+            ``UncertaintyModel``. Defaults to False, i.e. a single scenario with
+            the data as it is.
+
+    Returns:
+        dict[str, np.ndarray | float]: Scenario weights (S), load (S x T), maximum
+            and minimum capacity factors (S x G x T), generator data (G) and the
+            CO2 price.
+    """
+    gens = data.gen_names
+    max_cf = np.array([data.cf_data[gen]["max_cf"] for gen in gens], dtype=float)
+    min_cf = np.array([data.cf_data[gen]["min_cf"] for gen in gens], dtype=float)
+    load = np.array(data.load_series, dtype=float)
+
+    if uncertainty:
+        weights = np.array(data.scenario_weights, dtype=float)
+        base_load = load / data.prev_load_factor
+        load = np.outer(np.array(data.load_factors, dtype=float), base_load)
+        scenario_max_cf = np.repeat(max_cf[None], len(weights), axis=0)
+        for s, cfs in enumerate(data.cfs):
+            for g, gen in enumerate(gens):
+                if gen in cfs:
+                    scenario_max_cf[s, g] = cfs[gen]
+        max_cf = scenario_max_cf
+        min_cf = np.repeat(min_cf[None], len(weights), axis=0)
+    else:
+        weights = np.ones(1)
+        load = load[None]
+        max_cf = max_cf[None]
+        min_cf = min_cf[None]
+
+    arrays: dict[str, np.ndarray | float] = {
+        "weights": weights,
+        "load": load,
+        "max_cf": max_cf,
+        "min_cf": min_cf,
+        "co2_price": data.co2_price,
+    }
+    for key in [
+        "capex",
+        "fixed_opex",
+        "var_opex",
+        "decex",
+        "initial_capacity",
+        "max_capacity",
+        "co2",
+    ]:
+        arrays[key] = np.array([data.gen_data[gen][key] for gen in gens], dtype=float)
+    return arrays
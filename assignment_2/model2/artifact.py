@@ -0,0 +1,317 @@
+"""Precompiled expansion models for distribution to worker nodes.
+
+``compile_model`` builds an ``IntertemporalExpansionModel`` or
+``UncertaintyModel`` once and saves it as a compressed MPS file together with
+an index of the columns and rows of every generator, period and scenario.
+``ModelArtifact`` loads the saved model and applies changes of the maximum
+capacities, the CO2 price and the load directly to bounds, objective
+coefficients and right-hand sides. Loading only needs gurobipy and json, so
+workers neither import the data module nor run the model builder.
+"""
+
+import copy
+import json
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING
+
+from gurobipy import GRB, Env, read
+
+from assignment_2.utils.gurobi_env import get_default_env
+
+if TYPE_CHECKING:
+    from assignment_2.model2.data import DataModel
+
+MODEL_FILE = "model.mps.gz"
+INDEX_FILE = "index.json"
+
+
+def compile_model(
+    data: "DataModel",
+    directory: str | Path,
+    discount_factor: float = 1.0,
+    uncertainty: bool = False,
+    **options: bool,
+) -> Path:
+    """Build a model and save it as an artifact.
+
+    Args:
+        data (DataModel): Data for the optimization model. Not modified.
+        directory (str | Path): Directory for the model and index files.
+        discount_factor (float, optional): Discount factor for future costs. Defaults to 1.0.
+        uncertainty (bool, optional): Build the UncertaintyModel over all
+            scenarios. Defaults to False.
+        **options (bool): Further options of the model definition, e.g. scale,
+            integer, tighten or lean.
+
+    Returns:
+        Path: Directory of the artifact.
+    """
+    from assignment_2.model2.bounds import required_capacities
+    from assignment_2.model2.data import INFINITY
+    from assignment_2.model2.intertemporal_expansion_model import (
+        IntertemporalExpansionModel,
+    )
+    from assignment_2.model3.uncertainty_model import UncertaintyModel
+
+    if data.zone_names:
+        raise Exception("Models with zonal networks cannot be compiled.")
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    required = required_capacities(data)
+    weights = data.scenario_weights if uncertainty else [1.0]
+    name = "UncertaintyModel" if uncertainty else "IntertemporalExpansionModel"
+    periods = range(data.T)
+
+    model: IntertemporalExpansionModel
+    with UncertaintyModel() if uncertainty else IntertemporalExpansionModel() as model:
+        if uncertainty:
+            model.define_uncertainty_model(  # type: ignore
+                data=copy.deepcopy(data), discount_factor=discount_factor, **options
+            )
+        else:
+            model.define_model(
+                data=copy.deepcopy(data), discount_factor=discount_factor, **options
+            )
+        scaling = model.scaling
+        energy = scaling.energy if scaling is not None else 1.0
+
+        generators = {}
+        for gen in data.gen_names:
+            gen_data = data.gen_data[gen]
+            generators[gen] = {
+                "initial_capacity": gen_data["initial_capacity"],
+                "max_capacity": (
+                    gen_data["max_capacity"]
+                    if gen_data["max_capacity"] < INFINITY
+                    else None
+                ),
+                "co2": gen_data["co2"],
+                # Capacity needed to cover the load at load factor 1, None if
+                # the capacity is not tightened
+                "required_capacity": (
+                    required[gen] if gen in model.capacity_bounds else None
+                ),
+                **{
+                    key: [model.vars[f"{gen}_{key}_{t}"].index for t in periods]
+                    for key in ["cap", "inv", "dec"]
+                },
+                "gen": [
+                    [model.vars[f"{gen}_gen_{t}_{s}"].index for t in periods]
+                    for s in range(len(weights))
+                ],
+            }
+        index = {
+            "model": name,
+            "gen_names": data.gen_names,
+            "T": data.T,
+            "energy": energy,
+            "cost": scaling.cost if scaling is not None else 1.0,
+            "co2_price": data.co2_price,
+            "scenario_weights": weights,
+            "discounts": model.discounts,
+            "generators": generators,
+            "energy_balance": [
+                [model.constr[f"energy_balance_{t}_{s}"].index for t in periods]
+                for s in range(len(weights))
+            ],
+        }
+        model.model.write(str(directory / MODEL_FILE))
+
+    (directory / INDEX_FILE).write_text(json.dumps(index))
+    return directory
+
+
+class ModelArtifact:
+    """Compiled model loaded for solving with changed parameters.
+
+    All changes are given in the original units and relative to the compiled
+    data, so a loaded artifact can be reused for any number of solves.
+    """
+
+    def __init__(self, directory: str | Path, env: Env | None = None) -> None:
+        """Initialize instance.
+
+        Args:
+            directory (str | Path): Directory written by compile_model.
+            env (Env | None, optional): Environment for the Gurobi model.
+                Defaults to None, i.e. the environment shared within the process.
+        """
+        directory = Path(directory)
+        self.index = json.loads((directory / INDEX_FILE).read_text())
+        self.model = read(str(directory / MODEL_FILE), env=env or get_default_env())
+        self.vars = self.model.getVars()
+        self.constrs = self.model.getConstrs()
+        self.generators = self.index["generators"]
+        self.energy = self.index["energy"]
+        self.max_capacities = {
+            gen: gen_index["max_capacity"] for gen, gen_index in self.generators.items()
+        }
+        self.load_factor = 1.0
+
+        # Compiled values the changes are applied to
+        self.load = [
+            self.model.getAttr("RHS", self._rows(s))
+            for s in range(len(self.index["scenario_weights"]))
+        ]
+        self.generation_costs = {
+            gen: [
+                self.model.getAttr("Obj", self._columns(gen_index["gen"][s]))
+                for s in range(len(self.index["scenario_weights"]))
+            ]
+            for gen, gen_index in self.generators.items()
+        }
+
+    def __enter__(self) -> "ModelArtifact":
+        """Enter context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Exit context manager and dispose the Gurobi model."""
+        self.dispose()
+
+    def dispose(self) -> None:
+        """Free the Gurobi model."""
+        self.model.dispose()
+
+    def _columns(self, indices: list[int]) -> list:
+        """Get the variables at column indices.
+
+        Args:
+            indices (list[int]): Column indices.
+
+        Returns:
+            list: Variables.
+        """
+        return [self.vars[i] for i in indices]
+
+    def _rows(self, scenario: int) -> list:
+        """Get the energy balance constraints of a scenario.
+
+        Args:
+            scenario (int): Index of the scenario.
+
+        Returns:
+            list: Constraints per period.
+        """
+        return [self.constrs[i] for i in self.index["energy_balance"][scenario]]
+
+    def _update_bounds(self, gen: str) -> None:
+        """Set the capacity, investment and decommission bounds of a generator.
+
+        Args:
+            gen (str): Name of the generator.
+        """
+        gen_index = self.generators[gen]
+        bound = GRB.INFINITY
+        if gen_index["required_capacity"] is not None:
+            bound = (
+                max(
+                    gen_index["initial_capacity"],
+                    gen_index["required_capacity"] * self.load_factor,
+                )
+                / self.energy
+            )
+        max_capacity = self.max_capacities[gen]
+        cap_bound = min(
+            GRB.INFINITY if max_capacity is None else max_capacity / self.energy, bound
+        )
+        for name, value in [("cap", cap_bound), ("inv", bound), ("dec", bound)]:
+            columns = self._columns(gen_index[name])
+            self.model.setAttr("UB", columns, [value] * len(columns))
+
+    def set_max_capacity(self, gen: str, max_capacity: float | None) -> None:
+        """Change the maximum capacity of a generator.
+
+        Args:
+            gen (str): Name of the generator.
+            max_capacity (float | None): Maximum capacity in MWh, None for no limit.
+        """
+        if gen not in self.generators:
+            raise Exception(f"Generator {gen} is not in the model.")
+        self.max_capacities[gen] = max_capacity
+        self._update_bounds(gen)
+
+    def set_co2_price(self, co2_price: float) -> None:
+        """Change the CO2 price in the generation costs.
+
+        Args:
+            co2_price (float): CO2 price in DKK/tonCO2.
+        """
+        tightened = any(
+            gen_index["required_capacity"] is not None
+            for gen_index in self.generators.values()
+        )
+        if co2_price < 0 and tightened:
+            raise Exception(
+                "Capacity bounds are only valid for nonnegative CO2 prices."
+            )
+
+        # Change of the CO2 price in model units
+        change = (
+            (co2_price - self.index["co2_price"]) * self.energy / self.index["cost"]
+        )
+        discounts = self.index["discounts"]
+        for gen, gen_index in self.generators.items():
+            for s, weight in enumerate(self.index["scenario_weights"]):
+                self.model.setAttr(
+                    "Obj",
+                    self._columns(gen_index["gen"][s]),
+                    [
+                        cost + weight * discounts[t] * gen_index["co2"] * change
+                        for t, cost in enumerate(self.generation_costs[gen][s])
+                    ],
+                )
+
+    def scale_load(self, factor: float) -> None:
+        """Scale the load of all periods and scenarios.
+
+        The tightened capacity bounds are scaled along with the load.
+
+        Args:
+            factor (float): Factor relative to the compiled load.
+        """
+        self.load_factor = factor
+        for s, load in enumerate(self.load):
+            self.model.setAttr("RHS", self._rows(s), [value * factor for value in load])
+        for gen in self.generators:
+            self._update_bounds(gen)
+
+    def optimize(self) -> None:
+        """Optimize the model."""
+        self.model.optimize()
+
+    def get_results(self) -> tuple[dict[str, dict[str, list[float]]], float]:
+        """Get optimization results.
+
+        Returns:
+            tuple[dict[str, dict[str, list[float]]], float]: Capacities,
+                investments and decommissions per generator in MWh, and the
+                objective value in DKK.
+        """
+        if self.model.getAttr("Status") != GRB.OPTIMAL and not (
+            self.model.IsMIP and self.model.SolCount > 0
+        ):
+            raise Exception("Optimization was not successful.")
+
+        results: dict[str, dict[str, list[float]]] = {
+            key: {
+                gen: [
+                    value * self.energy
+                    for value in self.model.getAttr("X", self._columns(gen_index[name]))
+                ]
+                for gen, gen_index in self.generators.items()
+            }
+            for key, name in [
+                ("capacities", "cap"),
+                ("investments", "inv"),
+                ("decommissions", "dec"),
+            ]
+        }
+        return results, self.model.ObjVal * self.index["cost"]
@@ -0,0 +1,113 @@
+"""Post-solve audit of expansion model solutions.
+
+Rechecks a solution against the data with NumPy, independent of the solver
+that produced it: the residuals of every constraint family and the
+discounted objective are recomputed for all scenarios at once.
+
+Solutions are given as arrays, ``cap``, ``inv`` and ``dec`` of shape
+generator x period and ``gen`` of shape scenario x generator x period, as
+returned by ``IntertemporalExpansionModel.get_solution_arrays`` or
+``LinearProgram.get``. The solution must be in the same units as the data.
+"""
+
+import numpy as np
+
+from assignment_2.model2.arrays import scenario_arrays
+from assignment_2.model2.data import INFINITY, DataModel
+
+
+def _max_violation(violation: np.ndarray) -> float:
+    """Get the largest positive entry.
+
+    Args:
+        violation (np.ndarray): Violations, negative where a constraint has slack.
+
+    Returns:
+        float: Largest violation, zero if none is positive.
+    """
+    # Adding zero turns a maximum of -0.0 into 0.0
+    return float(violation.max(initial=0.0)) + 0.0
+
+
+def objective_value(
+    data: DataModel,
+    solution: dict[str, np.ndarray],
+    discount_factor: float = 1.0,
+    uncertainty: bool = False,
+) -> float:
+    """Recompute the discounted objective value of a solution.
+
+    The first-stage costs are counted in every scenario objective, as in the
+    models, so they are weighted with the sum of the scenario weights.
+
+    Args:
+        data (DataModel): Data for the optimization model.
+        solution (dict[str, np.ndarray]): Solution arrays cap, inv, dec and gen.
+        discount_factor (float, optional): Discount factor for future costs. Defaults to 1.0.
+        uncertainty (bool, optional): The solution covers all uncertainty
+            scenarios. Defaults to False.
+
+    Returns:
+        float: Objective value.
+    """
+    arrays = scenario_arrays(data, uncertainty=uncertainty)
+    discount = 1 / (1 + discount_factor) ** np.arange(data.T)
+    first_stage = (
+        arrays["fixed_opex"] @ solution["cap"]
+        + arrays["capex"] @ solution["inv"]
+        + arrays["decex"] @ solution["dec"]
+    ) @ discount
+    marginal = arrays["var_opex"] + arrays["co2_price"] * arrays["co2"]
+    second_stage = np.einsum(
+        "s,g,sgt,t->", arrays["weights"], marginal, solution["gen"], discount
+    )
+    return float(arrays["weights"].sum() * first_stage + second_stage)
+
+
+def audit_solution(
+    data: DataModel,
+    solution: dict[str, np.ndarray],
+    discount_factor: float = 1.0,
+    uncertainty: bool = False,
+) -> dict[str, float]:
+    """Get the largest constraint violation of every family and the objective.
+
+    Violations are absolute, in the units of the data, and zero for a feasible
+    solution.
+
+    Args:
+        data (DataModel): Data for the optimization model.
+        solution (dict[str, np.ndarray]): Solution arrays cap, inv, dec and gen.
+        discount_factor (float, optional): Discount factor for future costs. Defaults to 1.0.
+        uncertainty (bool, optional): The solution covers all uncertainty
+            scenarios. Defaults to False.
+
+    Returns:
+        dict[str, float]: Maximum violation of the energy balance, gen_max,
+            gen_min, capacity evolution, maximum capacity and nonnegativity,
+            and the recomputed objective value.
+    """
+    if data.zone_names:
+        raise Exception("The audit does not support zonal networks.")
+
+    arrays = scenario_arrays(data, uncertainty=uncertainty)
+    cap, inv, dec, gen = (solution[key] for key in ["cap", "inv", "dec", "gen"])
+
+    # Capacity at the end of the previous period, initial capacity before t = 0
+    previous = np.concatenate(
+        [arrays["initial_capacity"][:, None], cap[:, :-1]], axis=1
+    )
+    max_capacity = np.where(
+        arrays["max_capacity"] < INFINITY, arrays["max_capacity"], np.inf
+    )
+    return {
+        "energy_balance": _max_violation(arrays["load"] - gen.sum(axis=1)),
+        "gen_max": _max_violation(gen - arrays["max_cf"] * cap[None]),
+        "gen_min": _max_violation(arrays["min_cf"] * cap[None] - gen),
+        "cap_evol": _max_violation(np.abs(cap - previous - inv + dec)),
+        "max_capacity": _max_violation(cap - max_capacity[:, None]),
+        "nonnegativity": _max_violation(
+            -np.concatenate([values.ravel() for values in [cap, inv, dec, gen]])
+        ),
+        "objective": objective_value(data, solution, discount_factor, uncertainty),
+    }
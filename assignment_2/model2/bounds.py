@@ -0,0 +1,153 @@
+"""Static bound tightening of the capacity and investment variables.
+
+A generator never needs more capacity than it takes to cover the highest
+load of any period and scenario on its own, i.e. the load divided by its
+capacity factor in that period. Clipping the capacity path of a solution at
+that bound keeps it feasible and, with nonnegative costs, does not increase
+its cost, so the bound is valid for an optimal solution. Investments and
+decommissions in a single period are limited by the same bound.
+
+The bounds are derived from the data before the model is built and give
+presolve and barrier finite boxes instead of infinite upper bounds.
+"""
+
+import logging
+
+from assignment_2.model2.data import INFINITY, DataModel
+
+logger = logging.getLogger(__name__)
+
+
+def _scenario_loads(data: DataModel) -> list[list[float]]:
+    """Get the load series of every uncertainty scenario.
+
+    Args:
+        data (DataModel): Data for the optimization model.
+
+    Returns:
+        list[list[float]]: Load series of the current data and of every scenario.
+    """
+    base_load = [load / data.prev_load_factor for load in data.load_series]
+    return [data.load_series] + [
+        [load * factor for load in base_load] for factor in data.load_factors
+    ]
+
+
+def _scenario_cfs(data: DataModel, gen: str) -> list[list[float]]:
+    """Get the maximum capacity factors of a generator in every scenario.
+
+    Args:
+        data (DataModel): Data for the optimization model.
+        gen (str): Name of the generator.
+
+    Returns:
+        list[list[float]]: Capacity factors of the current data and of every
+            scenario changing them.
+    """
+    cfs = [data.cf_data[gen]["max_cf"]]
+    for scenario_cfs in data.cfs:
+        if gen in scenario_cfs:
+            cf = scenario_cfs[gen]
+            cfs.append(cf if isinstance(cf, list) else [cf] * data.T)
+    return cfs
+
+
+def _has_nonnegative_costs(data: DataModel) -> bool:
+    """Check that no cost in the data is negative.
+
+    Args:
+        data (DataModel): Data for the optimization model.
+
+    Returns:
+        bool: True if all costs are nonnegative.
+    """
+    for gen in data.gen_names:
+        gen_data = data.gen_data[gen]
+        costs = [gen_data[key] for key in ["capex", "fixed_opex", "var_opex", "decex"]]
+        if min(costs) < 0 or data.co2_price * gen_data["co2"] < 0:
+            return False
+    return all(
+        data.line_data[line][key] >= 0
+        for line in data.line_names
+        for key in ["capex", "fixed_opex"]
+    )
+
+
+def required_capacities(
+    data: DataModel, exclude: list[str] | None = None
+) -> dict[str, float]:
+    """Get the capacity every generator needs to cover the load on its own.
+
+    Args:
+        data (DataModel): Data for the optimization model.
+        exclude (list[str] | None, optional): Generators to leave out. Defaults
+            to None.
+
+    Returns:
+        dict[str, float]: Highest load over all periods and scenarios divided by
+            the generator's capacity factor in that period, 0 for generators
+            that never produce.
+    """
+    loads = _scenario_loads(data)
+    return {
+        gen: max(
+            (
+                load[t] / cf[t]
+                for load in loads
+                for cf in _scenario_cfs(data, gen)
+                for t in range(data.T)
+                if cf[t] > 0
+            ),
+            default=0.0,
+        )
+        for gen in data.gen_names
+        if gen not in (exclude or [])
+    }
+
+
+def capacity_bounds(
+    data: DataModel, exclude: list[str] | None = None
+) -> dict[str, float]:
+    """Derive upper bounds on the capacity of every generator.
+
+    The bound is the capacity from required_capacities, but at least the
+    initial capacity. Generators that never produce are bounded by their
+    initial capacity.
+
+    Args:
+        data (DataModel): Data for the optimization model.
+        exclude (list[str] | None, optional): Generators to leave out, e.g. those
+            with lumpy investments where clipping would break integrality.
+            Defaults to None.
+
+    Returns:
+        dict[str, float]: Upper bound per generator, in the units of the data.
+            Empty if the data has negative costs, where the bounds are not valid.
+    """
+    if not _has_nonnegative_costs(data):
+        logger.info("Bounds not tightened since the data has negative costs.")
+        return {}
+
+    return {
+        gen: max(data.gen_data[gen]["initial_capacity"], required)
+        for gen, required in required_capacities(data, exclude).items()
+    }
+
+
+def format_report(data: DataModel, bounds: dict[str, float]) -> str:
+    """Format the changes of the capacity bounds for logging.
+
+    Args:
+        data (DataModel): Data for the optimization model.
+        bounds (dict[str, float]): Bounds from capacity_bounds.
+
+    Returns:
+        str: Old and new upper bound of every tightened generator.
+    """
+    changes = []
+    for gen, bound in bounds.items():
+        max_capacity = data.gen_data[gen]["max_capacity"]
+        if bound < max_capacity:
+            old = "inf" if max_capacity >= INFINITY else f"{max_capacity:.3e}"
+            changes.append(f"{gen} {old} -> {bound:.3e}")
+    return ", ".join(changes) if changes else "none"
@@ -3,8 +3,10 @@
 Including data for uncertainty modeling.
 """
 
-import numpy as np
-from gurobipy import GRB
+import copy
+
+# Same value as gurobipy.GRB.INFINITY, defined here to avoid importing gurobipy
+INFINITY = 1e100
 
 
 class DataModel:
@@ -23,6 +25,12 @@ class DataModel:
         self.cfs: list[dict[str, float | list[float]]] = []
         self.load_factors: list[float] = []
         self.colors: dict[str, str] = {}
+        self.zone_names: list[str] = []
+        self.zone_load_shares: dict[str, float] = {}
+        self.gen_zones: dict[str, str] = {}
+        self.line_names: list[str] = []
+        self.line_data: dict[str, dict[str, float]] = {}
+        self.line_zones: dict[str, tuple[str, str]] = {}
 
     def add_load_series(self, load_series: list[float]) -> None:
         """Add load series to the instance.
@@ -49,11 +57,13 @@ class DataModel:
         var_opex: float = 0,
         decex: float = 0,
         initial_capacity: float = 0,
-        max_capacity: float = GRB.INFINITY,
+        max_capacity: float = INFINITY,
         max_cf: list[float] | float = 1,
         min_cf: list[float] | float = 0,
         co2: float = 0,
         color: str = "black",
+        unit_size: float = 0,
+        zone: str | None = None,
     ) -> None:
         """Add generator data to the instance.
 
@@ -71,6 +81,11 @@ class DataModel:
                 If list, must match length of load_series.
             co2 (float, optional): CO2 emissions unit generated. Defaults to 0.
             color (str, optional): Color for plotting. Defaults to "black".
+            unit_size (float, optional): Capacity of one unit. Investments are
+                integer multiples of it in integer mode. Defaults to 0, i.e.
+                continuous investments.
+            zone (str | None, optional): Zone the generator is located in. Required
+                if zones are added. Defaults to None.
         """
         if not isinstance(max_cf, list):
             max_cf = [max_cf] * self.T
@@ -85,6 +100,7 @@ class DataModel:
             "initial_capacity": initial_capacity,
             "max_capacity": max_capacity,
             "co2": co2,
+            "unit_size": unit_size,
         }
         self.cf_data[gen_name] = {
             "max_cf": max_cf,
@@ -92,9 +108,62 @@ class DataModel:
         }
 
         self.gen_names.append(gen_name)
+        if zone is not None:
+            self.gen_zones[gen_name] = zone
 
         self.colors[gen_name] = color
 
+    def add_zone(self, zone_name: str, load_share: float = 0) -> None:
+        """Add a zone of the transmission network to the instance.
+
+        Without zones the system is modelled as a single node.
+
+        Args:
+            zone_name (str): Name of the zone.
+            load_share (float, optional): Share of the load series consumed in
+                the zone. Defaults to 0.
+        """
+        self.zone_names.append(zone_name)
+        self.zone_load_shares[zone_name] = load_share
+
+    def add_line(
+        self,
+        line_name: str,
+        from_zone: str,
+        to_zone: str,
+        capex: float = 0,
+        fixed_opex: float = 0,
+        initial_capacity: float = 0,
+        max_capacity: float = INFINITY,
+    ) -> None:
+        """Add a transmission line between two zones to the instance.
+
+        Args:
+            line_name (str): Name of the line.
+            from_zone (str): Zone at the start of the line. Positive flows go
+                from this zone to to_zone.
+            to_zone (str): Zone at the end of the line.
+            capex (float, optional): Capital expenditure of transmission capacity.
+                Defaults to 0.
+            fixed_opex (float, optional): Fixed operational expenditure. Defaults to 0.
+            initial_capacity (float, optional): Initial transmission capacity.
+                Defaults to 0.
+            max_capacity (float, optional): Maximum transmission capacity.
+                Defaults to INFINITY.
+        """
+        for zone in [from_zone, to_zone]:
+            if zone not in self.zone_load_shares:
+                raise Exception(f"Line {line_name} connects unknown zone {zone}.")
+
+        self.line_data[line_name] = {
+            "capex": capex,
+            "fixed_opex": fixed_opex,
+            "initial_capacity": initial_capacity,
+            "max_capacity": max_capacity,
+        }
+        self.line_zones[line_name] = (from_zone, to_zone)
+        self.line_names.append(line_name)
+
     def set_cf(self, cf: dict[str, float | list[float]]) -> None:
         """Set a factor to scale all renewable generators' capacity factors.
 
@@ -139,6 +208,88 @@ class DataModel:
         self.cfs = cfs
         self.load_factors = load_factors
 
+    def get_scenario(self, scenario: int) -> "DataModel":
+        """Create a copy of the data with a single uncertainty scenario applied.
+
+        Args:
+            scenario (int): Index of the uncertainty scenario.
+
+        Returns:
+            DataModel: Deterministic data of the scenario.
+        """
+        data = copy.deepcopy(self)
+        data.set_cf(self.cfs[scenario])
+        data.scale_load(self.load_factors[scenario])
+        return data
+
+    def reduce_scenarios(self, n_scenarios: int) -> "DataModel":
+        """Create a copy of the data with only the most likely scenarios.
+
+        The weights of the kept scenarios are rescaled to the original total
+        weight.
+
+        Args:
+            n_scenarios (int): Number of scenarios to keep.
+
+        Returns:
+            DataModel: Data with at most n_scenarios uncertainty scenarios.
+        """
+        data = copy.deepcopy(self)
+        if n_scenarios >= len(self.scenario_weights):
+            return data
+
+        keep = sorted(
+            sorted(
+                range(len(self.scenario_weights)),
+                key=lambda i: self.scenario_weights[i],
+                reverse=True,
+            )[:n_scenarios]
+        )
+        kept_weight = sum(self.scenario_weights[i] for i in keep)
+        data.set_scenario_factors(
+            scenario_weights=[
+                self.scenario_weights[i] * sum(self.scenario_weights) / kept_weight
+                for i in keep
+            ],
+            cfs=[self.cfs[i] for i in keep],
+            load_factors=[self.load_factors[i] for i in keep],
+        )
+        return data
+
+    def get_expected_value(self) -> "DataModel":
+        """Create a copy of the data with the expected values of the scenarios.
+
+        The load factor and the capacity factors are averaged over the
+        scenarios using the normalized scenario weights. Capacity factors are
+        only averaged for generators given in every scenario.
+
+        Returns:
+            DataModel: Deterministic data of the expected value problem.
+        """
+        total_weight = sum(self.scenario_weights)
+        weights = [weight / total_weight for weight in self.scenario_weights]
+
+        cf: dict[str, float | list[float]] = {}
+        for gen in set.intersection(*(set(cfs) for cfs in self.cfs)):
+            scenario_cfs = [
+                cfs[gen] if isinstance(cfs[gen], list) else [cfs[gen]] * self.T
+                for cfs in self.cfs
+            ]
+            cf[gen] = [
+                sum(
+                    w * values[t]
+                    for w, values in zip(weights, scenario_cfs, strict=True)
+                )
+                for t in range(self.T)
+            ]
+
+        data = copy.deepcopy(self)
+        data.set_cf(cf)
+        data.scale_load(
+            sum(w * f for w, f in zip(weights, self.load_factors, strict=True))
+        )
+        return data
+
     def jonas(self) -> None:
         """Predefined test data Jonas.
 
@@ -150,34 +301,33 @@ class DataModel:
             CO2_price = DKK/tonCO2
             CAPEX, DECEX, fixed_OPEX = DKK/MWh/year
             var_OPEX = DKK/MWh
+            Unit size = MWh/year
         """
         hours_per_year = 365 * 24
-        load = np.array(
-            [
-                36,
-                37.1,
-                38.2,
-                39.3,
-                40.4,
-                41.5,
-                42.6,
-                43.7,
-                44.8,
-                45.9,
-                47,
-                48.2,
-                49.4,
-                50.6,
-                51.8,
-                53,
-                54.2,
-                55.4,
-                56.6,
-                57.8,
-                59,
-            ]
-        )
-        self.add_load_series((load * 10**6).tolist())
+        load = [
+            36,
+            37.1,
+            38.2,
+            39.3,
+            40.4,
+            41.5,
+            42.6,
+            43.7,
+            44.8,
+            45.9,
+            47,
+            48.2,
+            49.4,
+            50.6,
+            51.8,
+            53,
+            54.2,
+            55.4,
+            56.6,
+            57.8,
+            59,
+        ]
+        self.add_load_series([value * 10.0**6 for value in load])
         self.add_co2_price(32.6)
         self.add_generator(
             gen_name="Offshore Wind",
@@ -186,11 +336,12 @@ class DataModel:
             var_opex=3.45,
             decex=507_000 * hours_per_year,
             initial_capacity=2469 * hours_per_year,
-            max_capacity=GRB.INFINITY,
+            max_capacity=INFINITY,
             max_cf=1,
             min_cf=0,
             co2=0,
             color="#3967FF",
+            unit_size=800 * hours_per_year,
         )
         self.add_generator(
             gen_name="Onshore Wind",
@@ -199,11 +350,12 @@ class DataModel:
             var_opex=1.98,
             decex=86_400 * hours_per_year,
             initial_capacity=4808 * hours_per_year,
-            max_capacity=GRB.INFINITY,
+            max_capacity=INFINITY,
             max_cf=1,
             min_cf=0,
             co2=0,
             color="#45A946",
+            unit_size=50 * hours_per_year,
         )
         self.add_generator(
             gen_name="Solar PV",
@@ -212,11 +364,12 @@ class DataModel:
             var_opex=0,
             decex=43_200 * hours_per_year,
             initial_capacity=3529 * hours_per_year,
-            max_capacity=GRB.INFINITY,
+            max_capacity=INFINITY,
             max_cf=1,
             min_cf=0,
             co2=0,
             color="#EAE561",
+            unit_size=50 * hours_per_year,
         )
         self.add_generator(
             gen_name="Coal",
@@ -225,11 +378,12 @@ class DataModel:
             var_opex=3.21,
             decex=0,
             initial_capacity=2191 * hours_per_year,
-            max_capacity=GRB.INFINITY,
+            max_capacity=INFINITY,
             max_cf=1,
             min_cf=0,
             co2=0.84,
             color="black",
+            unit_size=400 * hours_per_year,
         )
         self.add_generator(
             gen_name="Natural Gas",
@@ -238,11 +392,12 @@ class DataModel:
             var_opex=5.40,
             decex=0,
             initial_capacity=1706 * hours_per_year,
-            max_capacity=GRB.INFINITY,
+            max_capacity=INFINITY,
             max_cf=1,
             min_cf=0,
             co2=0.37,
             color="brown",
+            unit_size=400 * hours_per_year,
         )
         self.set_scenario_factors(
             scenario_weights=[
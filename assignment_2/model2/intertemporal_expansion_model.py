@@ -1,20 +1,38 @@
 """Implementation of optimization model 2."""
 
-import matplotlib.pyplot as plt
-import numpy as np
-from gurobipy import GRB, Model, quicksum
+import logging
+import math
+from typing import TYPE_CHECKING
 
+from gurobipy import GRB, Env, LinExpr, Var, quicksum
+
+from assignment_2.model2.bounds import capacity_bounds, format_report
 from assignment_2.model2.data import DataModel
+from assignment_2.model2.scaling import Scaling
+from assignment_2.utils.gurobi_env import EnvPool, GurobiModel
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
 
 
-class IntertemporalExpansionModel:
+class IntertemporalExpansionModel(GurobiModel):
     """Intertemporal expansion optimization model.
 
     Including multiple time periods and investment decisions.
     """
 
-    def __init__(self) -> None:
-        """Initialize instance."""
+    def __init__(self, env: Env | EnvPool | None = None) -> None:
+        """Initialize instance.
+
+        Args:
+            env (Env | EnvPool | None, optional): Environment, or pool of
+                environments, for the Gurobi model. Defaults to None, i.e. the
+                environment shared within the process.
+        """
+        super().__init__(env)
+        self.scaling: Scaling | None = None
 
     def define_model(
         self,
@@ -22,6 +40,11 @@ class IntertemporalExpansionModel:
         discount_factor: float = 1.0,
         model_id: int = 0,
         weight: float = 1.0,
+        scale: bool = False,
+        integer: bool = False,
+        tighten: bool = True,
+        lean: bool = False,
+        multi_objective: bool = False,
     ) -> None:
         """Define the optimization model and its parameters.
 
@@ -32,124 +55,527 @@ class IntertemporalExpansionModel:
                 if multiple models are created together. Defaults to 0.
                 Leave blank if objective should be defined in this method.
             weight (float, optional): Weight of the objective if multiple
+            scale (bool, optional): Build the model in energy and cost units chosen
+                from the data. Results are returned in the original units.
+                Defaults to False. Only read when model_id is 0.
+            integer (bool, optional): Restrict investments to integer multiples of
+                the generators' unit sizes. Generators with unit size 0 keep
+                continuous investments. Defaults to False. Only read when
+                model_id is 0.
+            tighten (bool, optional): Bound the capacities, investments and
+                decommissions by the capacity needed to cover the load, derived
+                from the data over all scenarios. Defaults to True. Only read
+                when model_id is 0.
+            lean (bool, optional): Reduce the memory of the model by leaving out
+                the names of variables and constraints and the gen_min
+                constraints with a zero capacity factor. Defaults to False. Only
+                read when model_id is 0.
+            multi_objective (bool, optional): Give every model instance its own
+                weighted objective instead of adding the weighted costs to one
+                objective. Kept for comparison, the objective value is the same.
+                Defaults to False. Only read when model_id is 0.
         """
         # Create gurobi model
         if model_id == 0:
-            self.model = Model("IntertemporalExpansionModel")
-            self.model.setParam("OutputFlag", 0)
+            self.new_model("IntertemporalExpansionModel")
+            self.model.ModelSense = GRB.MINIMIZE
             self.vars = {}
             self.constr = {}
+            self.emissions = LinExpr()
+            self.scaling = Scaling.from_data(data, discount_factor) if scale else None
+            self.discount_factor = discount_factor
+            self.integer = integer
+            self.tighten = tighten
+            self.lean = lean
+            self.multi_objective = multi_objective
+            self.T = 0
+            self.gen_names: list[str] = []
+
+        self._add_elements(data, model_id, weight, previous_T=0, previous_gens=[])
+
+    def extend(self, data: DataModel, model_id: int = 0, weight: float = 1.0) -> None:
+        """Append periods and generators to the built model.
+
+        Only the variables and constraints of the new periods and generators
+        are added, new generators are added to the existing energy balances
+        and the objective coefficients of the new variables are set. A solved
+        model is warm started from its previous solution.
 
-        self.gen_names = data.gen_names
-        self.T = data.T
-        self.colors = data.colors
+        Args:
+            data (DataModel): Data with all periods and generators of the built
+                model, in the same order, followed by the new ones.
+            model_id (int, optional): Identifier for the model instance, extended
+                in the same order as defined. Defaults to 0.
+            weight (float, optional): Weight of the objective if multiple.
+        """
+        if model_id == 0:
+            if (
+                data.T < self.T
+                or data.gen_names[: len(self.gen_names)] != self.gen_names
+            ):
+                raise Exception(
+                    "The data must contain the periods and generators of the model."
+                )
+            if data.zone_names:
+                raise Exception("Models with zonal networks cannot be extended.")
+            self.previous = (self.T, list(self.gen_names))
 
-        # Define variables
-        for t in range(data.T):
-            for gen in data.gen_names:
-                if model_id == 0:
-                    # Capacity at each time period for each generator
-                    self.vars[f"{gen}_cap_{t}"] = self.model.addVar(
-                        name=f"{gen}_cap_{t}",
-                        lb=0,
-                        ub=data.gen_data[gen]["max_capacity"],
-                    )
+        previous_T, previous_gens = self.previous
+        self._add_elements(data, model_id, weight, previous_T, previous_gens)
 
-                    # Investment decision at each time period for each generator
-                    self.vars[f"{gen}_inv_{t}"] = self.model.addVar(
-                        name=f"{gen}_inv_{t}", lb=0, ub=GRB.INFINITY
-                    )
+    def _add_elements(
+        self,
+        data: DataModel,
+        model_id: int,
+        weight: float,
+        previous_T: int,
+        previous_gens: list[str],
+    ) -> None:
+        """Add the variables and constraints of periods and generators.
 
-                    # Decommissioning decision at each time period for each generator
-                    self.vars[f"{gen}_dec_{t}"] = self.model.addVar(
-                        name=f"{gen}_dec_{t}", lb=0, ub=GRB.INFINITY
-                    )
+        Every generator and period not already in the scenario, i.e. from
+        period previous_T on or not in previous_gens, is added.
 
-                # Generation at each time period for each generator
-                self.vars[f"{gen}_gen_{t}_{model_id}"] = self.model.addVar(
-                    name=f"{gen}_gen_{t}_{model_id}",
+        Args:
+            data (DataModel): Data for the optimization model.
+            model_id (int): Identifier for the model instance.
+            weight (float): Weight of the objective if multiple.
+            previous_T (int): Number of periods already in the scenario.
+            previous_gens (list[str]): Generators already in the scenario.
+        """
+        extending = previous_T > 0
+        if model_id == 0 and self.tighten:
+            # Clipping lumpy investments at the bound would break integrality
+            self.capacity_bounds = capacity_bounds(
+                data,
+                exclude=[
+                    gen
+                    for gen in data.gen_names
+                    if self.integer and data.gen_data[gen]["unit_size"] > 0
+                ],
+            )
+            logger.info(
+                "Tightened capacity bounds: %s",
+                format_report(data, self.capacity_bounds),
+            )
+        elif model_id == 0:
+            self.capacity_bounds = {}
+
+        energy = self.scaling.energy if self.scaling is not None else 1.0
+        bounds = {gen: bound / energy for gen, bound in self.capacity_bounds.items()}
+        if self.scaling is not None:
+            data = self.scaling.scale_data(data)
+
+        if model_id == 0:
+            if extending:
+                self._update_bounds(data, bounds, previous_T, previous_gens)
+            self.discounts = [
+                1 / (1 + self.discount_factor) ** t for t in range(data.T)
+            ]
+            # Total weight of the model instances sharing the investment decisions
+            self.first_stage_weight = 0.0
+            self.gen_names = list(data.gen_names)
+            # Capacity limits of the data in model units, without tightening
+            self.max_capacities = {
+                gen: data.gen_data[gen]["max_capacity"] for gen in data.gen_names
+            }
+            self.T = data.T
+            self.colors = data.colors
+            self.line_names = data.line_names
+        self.n_scenarios = model_id + 1
+
+        # Elements of this scenario to add
+        new = [
+            (t, gen)
+            for t in range(data.T)
+            for gen in data.gen_names
+            if t >= previous_T or gen not in previous_gens
+        ]
+
+        # Define variables
+        for t, gen in new:
+            if model_id == 0:
+                # Capacity at each time period for each generator
+                self.vars[f"{gen}_cap_{t}"] = self.model.addVar(
+                    name=self._name(f"{gen}_cap_{t}"),
                     lb=0,
+                    ub=min(
+                        data.gen_data[gen]["max_capacity"],
+                        bounds.get(gen, GRB.INFINITY),
+                    ),
                 )
 
-        # Define objective
-        self.model.ModelSense = GRB.MINIMIZE
-        self.model.setObjectiveN(
-            quicksum(
-                quicksum(
-                    self.vars[f"{gen}_gen_{t}_{model_id}"]
-                    * (
-                        data.gen_data[gen]["var_opex"]
-                        + data.co2_price * data.gen_data[gen]["co2"]
-                    )
-                    + data.gen_data[gen]["fixed_opex"] * self.vars[f"{gen}_cap_{t}"]
-                    + self.vars[f"{gen}_inv_{t}"] * data.gen_data[gen]["capex"]
-                    + self.vars[f"{gen}_dec_{t}"] * data.gen_data[gen]["decex"]
-                    for gen in data.gen_names
+                # Investment decision at each time period for each generator
+                self.vars[f"{gen}_inv_{t}"] = self.model.addVar(
+                    name=self._name(f"{gen}_inv_{t}"),
+                    lb=0,
+                    ub=bounds.get(gen, GRB.INFINITY),
                 )
-                / (1 + discount_factor) ** t
-                for t in range(data.T)
-            ),
-            index=model_id,
-            weight=weight,
-        )
 
-        # Define constraints
-        for t in range(data.T):
-            # Energy balance constraint
-            self.constr[f"energy_balance_{t}_{model_id}"] = self.model.addConstr(
-                quicksum(
-                    self.vars[f"{gen}_gen_{t}_{model_id}"] for gen in data.gen_names
+                # Decommissioning decision at each time period for each generator
+                self.vars[f"{gen}_dec_{t}"] = self.model.addVar(
+                    name=self._name(f"{gen}_dec_{t}"),
+                    lb=0,
+                    ub=bounds.get(gen, GRB.INFINITY),
                 )
-                >= data.load_series[t],
-                name=f"energy_balance_{t}_{model_id}",
+
+                # Number of units invested in at each time period in integer mode
+                if self.integer and data.gen_data[gen]["unit_size"] > 0:
+                    self.vars[f"{gen}_units_{t}"] = self.model.addVar(
+                        name=self._name(f"{gen}_units_{t}"),
+                        lb=0,
+                        vtype=GRB.INTEGER,
+                    )
+
+            # Generation at each time period for each generator
+            self.vars[f"{gen}_gen_{t}_{model_id}"] = self.model.addVar(
+                name=self._name(f"{gen}_gen_{t}_{model_id}"),
+                lb=0,
             )
 
-            for gen in data.gen_names:
-                # Generation constraints
-                self.constr[f"gen_max_{gen}_{t}_{model_id}"] = self.model.addConstr(
-                    self.vars[f"{gen}_gen_{t}_{model_id}"]
-                    <= self.vars[f"{gen}_cap_{t}"] * data.cf_data[gen]["max_cf"][t],
-                    name=f"gen_max_{gen}_{t}_{model_id}",
+        # Transmission capacities and flows of the zonal network
+        if data.zone_names:
+            self._add_network_variables(data, model_id)
+
+        # Define objective
+        # Investment decisions are shared by all model instances, generation
+        # is specific to this one
+        first_stage_vars = []
+        first_stage_costs = []
+        generation_vars = []
+        generation_costs = []
+        for t, gen in new:
+            gen_data = data.gen_data[gen]
+            for name, key in [
+                ("cap", "fixed_opex"),
+                ("inv", "capex"),
+                ("dec", "decex"),
+            ]:
+                first_stage_vars.append(self.vars[f"{gen}_{name}_{t}"])
+                first_stage_costs.append(gen_data[key] * self.discounts[t])
+            generation_vars.append(self.vars[f"{gen}_gen_{t}_{model_id}"])
+            generation_costs.append(
+                (gen_data["var_opex"] + data.co2_price * gen_data["co2"])
+                * self.discounts[t]
+            )
+        if data.line_names and not extending:
+            line_costs, line_vars = self._line_costs(data)
+            first_stage_vars += line_vars
+            first_stage_costs += line_costs
+
+        if self.multi_objective:
+            cost_vars = first_stage_vars + generation_vars
+            costs = first_stage_costs + generation_costs
+            if extending:
+                self.model.setParam("ObjNumber", model_id)
+                self.model.setAttr("ObjN", cost_vars, costs)
+            else:
+                self.model.setObjectiveN(
+                    LinExpr(costs, cost_vars), index=model_id, weight=weight
                 )
+        else:
+            # Expected costs: investment costs weighted by the total weight of
+            # the model instances and generation costs by their own weight
+            self.first_stage_weight += weight
+            self.model.setAttr(
+                "Obj",
+                first_stage_vars,
+                [cost * self.first_stage_weight for cost in first_stage_costs],
+            )
+            self.model.setAttr(
+                "Obj", generation_vars, [cost * weight for cost in generation_costs]
+            )
+
+        # Total emissions, weighted like the objective if multiple
+        emitting = [
+            (data.gen_data[gen]["co2"], self.vars[f"{gen}_gen_{t}_{model_id}"])
+            for t, gen in new
+            if data.gen_data[gen]["co2"] != 0
+        ]
+        for co2, var in emitting:
+            self.emissions.add(var, co2 * weight)
+            if "emission_cap" in self.constr:
+                self.model.chgCoeff(self.constr["emission_cap"], var, co2 * weight)
 
+        # Define constraints
+        # Energy balance constraint, per zone below if the network is modelled
+        if not data.zone_names:
+            for t in range(data.T):
+                if t >= previous_T:
+                    self.constr[f"energy_balance_{t}_{model_id}"] = (
+                        self.model.addConstr(
+                            quicksum(
+                                self.vars[f"{gen}_gen_{t}_{model_id}"]
+                                for gen in data.gen_names
+                            )
+                            >= data.load_series[t],
+                            name=self._name(f"energy_balance_{t}_{model_id}"),
+                        )
+                    )
+                else:
+                    # New generators in an existing period
+                    for gen in data.gen_names[len(previous_gens) :]:
+                        self.model.chgCoeff(
+                            self.constr[f"energy_balance_{t}_{model_id}"],
+                            self.vars[f"{gen}_gen_{t}_{model_id}"],
+                            1.0,
+                        )
+
+        for t, gen in new:
+            # Generation constraints
+            self.constr[f"gen_max_{gen}_{t}_{model_id}"] = self.model.addConstr(
+                self.vars[f"{gen}_gen_{t}_{model_id}"]
+                <= self.vars[f"{gen}_cap_{t}"] * data.cf_data[gen]["max_cf"][t],
+                name=self._name(f"gen_max_{gen}_{t}_{model_id}"),
+            )
+
+            # Left out in lean mode if it reduces to the lower bound of zero
+            if not self.lean or data.cf_data[gen]["min_cf"][t] != 0:
                 self.constr[f"gen_min_{gen}_{t}_{model_id}"] = self.model.addConstr(
                     self.vars[f"{gen}_gen_{t}_{model_id}"]
                     >= self.vars[f"{gen}_cap_{t}"] * data.cf_data[gen]["min_cf"][t],
-                    name=f"gen_min_{gen}_{t}_{model_id}",
+                    name=self._name(f"gen_min_{gen}_{t}_{model_id}"),
                 )
 
-                # Generation capacity evolution constraints
-                if model_id == 0:
-                    if t == 0:
-                        self.constr[f"cap_evol_{gen}_{t}"] = self.model.addConstr(
-                            self.vars[f"{gen}_cap_{t}"]
-                            == data.gen_data[gen]["initial_capacity"]
-                            + self.vars[f"{gen}_inv_{t}"]
-                            - self.vars[f"{gen}_dec_{t}"],
-                            name=f"cap_evol_{gen}_{t}",
-                        )
-                    else:
-                        self.constr[f"cap_evol_{gen}_{t}"] = self.model.addConstr(
-                            self.vars[f"{gen}_cap_{t}"]
-                            == self.vars[f"{gen}_cap_{t - 1}"]
-                            + self.vars[f"{gen}_inv_{t}"]
-                            - self.vars[f"{gen}_dec_{t}"],
-                            name=f"cap_evol_{gen}_{t}",
-                        )
+            # Generation capacity evolution constraints
+            if model_id == 0:
+                if t == 0:
+                    self.constr[f"cap_evol_{gen}_{t}"] = self.model.addConstr(
+                        self.vars[f"{gen}_cap_{t}"]
+                        == data.gen_data[gen]["initial_capacity"]
+                        + self.vars[f"{gen}_inv_{t}"]
+                        - self.vars[f"{gen}_dec_{t}"],
+                        name=self._name(f"cap_evol_{gen}_{t}"),
+                    )
+                else:
+                    self.constr[f"cap_evol_{gen}_{t}"] = self.model.addConstr(
+                        self.vars[f"{gen}_cap_{t}"]
+                        == self.vars[f"{gen}_cap_{t - 1}"]
+                        + self.vars[f"{gen}_inv_{t}"]
+                        - self.vars[f"{gen}_dec_{t}"],
+                        name=self._name(f"cap_evol_{gen}_{t}"),
+                    )
+
+                # Lumpy investments in integer mode
+                if f"{gen}_units_{t}" in self.vars:
+                    self.constr[f"inv_units_{gen}_{t}"] = self.model.addConstr(
+                        self.vars[f"{gen}_inv_{t}"]
+                        == data.gen_data[gen]["unit_size"]
+                        * self.vars[f"{gen}_units_{t}"],
+                        name=self._name(f"inv_units_{gen}_{t}"),
+                    )
+
+        if data.zone_names:
+            self._add_network_constraints(data, model_id)
 
         self.model.update()
 
+    def _update_bounds(
+        self,
+        data: DataModel,
+        bounds: dict[str, float],
+        previous_T: int,
+        previous_gens: list[str],
+    ) -> None:
+        """Update the tightened bounds of the existing variables when extending.
+
+        Args:
+            data (DataModel): Data for the optimization model, in model units.
+            bounds (dict[str, float]): Capacity bounds in model units.
+            previous_T (int): Number of periods already in the model.
+            previous_gens (list[str]): Generators already in the model.
+        """
+        for gen in previous_gens:
+            bound = bounds.get(gen, GRB.INFINITY)
+            cap_bound = min(data.gen_data[gen]["max_capacity"], bound)
+            for t in range(previous_T):
+                self.vars[f"{gen}_cap_{t}"].UB = cap_bound
+                self.vars[f"{gen}_inv_{t}"].UB = bound
+                self.vars[f"{gen}_dec_{t}"].UB = bound
+
+    def _name(self, name: str) -> str:
+        """Get the name of a variable or constraint, empty in lean mode.
+
+        Args:
+            name (str): Name of the variable or constraint.
+
+        Returns:
+            str: Name to give to the solver.
+        """
+        return "" if self.lean else name
+
+    def _add_network_variables(self, data: DataModel, model_id: int) -> None:
+        """Add the transmission capacity, investment and flow variables.
+
+        Variables are added as matrix variables over line x period, ordered with
+        the period changing fastest.
+
+        Args:
+            data (DataModel): Data with zones and lines.
+            model_id (int): Identifier for the model instance.
+        """
+        import numpy as np
+
+        n_lines = len(data.line_names) * data.T
+        if model_id == 0:
+            max_capacity = np.repeat(
+                [data.line_data[line]["max_capacity"] for line in data.line_names],
+                data.T,
+            )
+            self.network_vars = {
+                "line_cap": self.model.addMVar(
+                    n_lines, lb=0, ub=max_capacity, name=self._name("line_cap")
+                ),
+                "line_inv": self.model.addMVar(
+                    n_lines, lb=0, name=self._name("line_inv")
+                ),
+            }
+        # Positive flows go from the start to the end zone of a line
+        self.network_vars[f"flow_{model_id}"] = self.model.addMVar(
+            n_lines, lb=-GRB.INFINITY, name=self._name(f"flow_{model_id}")
+        )
+
+    def _line_costs(self, data: DataModel) -> tuple[list[float], list[Var]]:
+        """Get the discounted costs of the transmission capacity.
+
+        Args:
+            data (DataModel): Data with lines.
+
+        Returns:
+            tuple[list[float], list[Var]]: Investment and fixed operational cost
+                coefficients of all lines and their variables.
+        """
+        import numpy as np
+
+        capex = [data.line_data[line]["capex"] for line in data.line_names]
+        fixed_opex = [data.line_data[line]["fixed_opex"] for line in data.line_names]
+        return (
+            np.outer(fixed_opex, self.discounts).ravel().tolist()
+            + np.outer(capex, self.discounts).ravel().tolist(),
+            self.network_vars["line_cap"].tolist()
+            + self.network_vars["line_inv"].tolist(),
+        )
+
+    def _add_network_constraints(self, data: DataModel, model_id: int) -> None:
+        """Add the zonal energy balances and the transmission limits.
+
+        Each group of constraints is added as one matrix constraint built from
+        the sparse incidence matrices.
+
+        Args:
+            data (DataModel): Data with zones and lines.
+            model_id (int): Identifier for the model instance.
+        """
+        import numpy as np
+        import scipy.sparse as sp
+        from gurobipy import MVar
+
+        from assignment_2.model2 import network
+
+        line_cap = self.network_vars["line_cap"]
+        flow = self.network_vars[f"flow_{model_id}"]
+        generation = MVar.fromlist(
+            [
+                self.vars[f"{gen}_gen_{t}_{model_id}"]
+                for gen in data.gen_names
+                for t in range(data.T)
+            ]
+        )
+
+        # Generation in the zone plus net import covers the zonal load
+        self.constr[f"zone_balance_{model_id}"] = self.model.addConstr(
+            network.per_period(network.generator_incidence(data), data.T) @ generation
+            + network.per_period(network.line_incidence(data), data.T) @ flow
+            >= network.zone_loads(data).ravel(),
+            name=self._name(f"zone_balance_{model_id}"),
+        )
+        self.constr[f"flow_max_{model_id}"] = self.model.addConstr(
+            flow <= line_cap, name=self._name(f"flow_max_{model_id}")
+        )
+        self.constr[f"flow_min_{model_id}"] = self.model.addConstr(
+            flow >= -line_cap, name=self._name(f"flow_min_{model_id}")
+        )
+
+        if model_id == 0:
+            # Transmission capacity evolution: cap_t - cap_{t-1} - inv_t = initial at t = 0
+            n_lines = len(data.line_names)
+            evolution = sp.csr_matrix(
+                sp.identity(n_lines * data.T)
+                - sp.kron(sp.identity(n_lines), sp.eye(data.T, k=-1))
+            )
+            initial = np.zeros((n_lines, data.T))
+            initial[:, 0] = [
+                data.line_data[line]["initial_capacity"] for line in data.line_names
+            ]
+            self.constr["line_cap_evol"] = self.model.addConstr(
+                evolution @ line_cap - self.network_vars["line_inv"] == initial.ravel(),
+                name=self._name("line_cap_evol"),
+            )
+
     def optimize(self) -> None:
         """Optimize the model."""
         self.model.optimize()
 
+    def optimize_integer(
+        self,
+        mip_gap: float | None = None,
+        time_limit: float | None = None,
+        start: dict[str, float] | None = None,
+    ) -> None:
+        """Optimize the model built in integer mode.
+
+        Without a start, the LP relaxation is solved first and its unit counts
+        are rounded up to a MIP start. The best solution found is kept if the
+        gap or time limit stops the solve early.
+
+        Args:
+            mip_gap (float | None, optional): Relative MIP gap to stop at.
+                Defaults to None, i.e. the solver default.
+            time_limit (float | None, optional): Time limit in seconds. Defaults
+                to None, i.e. no limit.
+            start (dict[str, float] | None, optional): Unit counts to start from,
+                e.g. get_start of a neighbouring sweep point. Defaults to None.
+        """
+        units = {key: var for key, var in self.vars.items() if "_units_" in key}
+        if start is None:
+            relaxed = self.model.relax()
+            relaxed.optimize()
+            if relaxed.getAttr("Status") == GRB.OPTIMAL:
+                relaxed_vars = relaxed.getVars()
+                start = {
+                    key: math.ceil(relaxed_vars[var.index].X - 1e-6)
+                    for key, var in units.items()
+                }
+            relaxed.dispose()
+
+        for key, value in (start or {}).items():
+            if key in units:
+                units[key].Start = value
+        if mip_gap is not None:
+            self.model.setParam("MIPGap", mip_gap)
+        if time_limit is not None:
+            self.model.setParam("TimeLimit", time_limit)
+        self.model.optimize()
+
+    def get_start(self) -> dict[str, float]:
+        """Get the unit counts of the best solution as start for a later solve.
+
+        Returns:
+            dict[str, float]: Number of units per variable key.
+        """
+        if self.model.SolCount == 0:
+            return {}
+        return {key: round(var.X) for key, var in self.vars.items() if "_units_" in key}
+
     def get_results(self) -> tuple[dict[str, dict[str, list[float]]], float]:
         """Get optimization results.
 
         Returns:
             dict[str, float | dict[str, list[float]]]: Dictionary with results.
         """
-        if self.model.getAttr("Status") != GRB.OPTIMAL:
+        if self.model.getAttr("Status") != GRB.OPTIMAL and not (
+            self.model.IsMIP and self.model.SolCount > 0
+        ):
             raise Exception("Optimization was not successful.")
 
         results: dict[str, dict[str, list[float]]] = {}
@@ -173,10 +599,179 @@ class IntertemporalExpansionModel:
                 self.vars[f"{gen}_dec_{t}"].X for t in range(self.T)
             ]
 
-        return results, self.model.objVal
+        # Transmission capacities and investments per timestamp
+        if self.line_names:
+            for key, name in [
+                ("line_capacities", "line_cap"),
+                ("line_investments", "line_inv"),
+            ]:
+                values = self.network_vars[name].X.reshape(len(self.line_names), self.T)
+                results[key] = {
+                    line: values[i].tolist() for i, line in enumerate(self.line_names)
+                }
+
+        if self.scaling is not None:
+            results = self.scaling.unscale_results(results)
+        return results, self.get_objective_value()
+
+    def get_solution_arrays(self) -> dict[str, "np.ndarray"]:
+        """Get the solution as arrays for the audit.
+
+        Returns:
+            dict[str, np.ndarray]: Capacities cap, investments inv and
+                decommissions dec (generator x period), and generation gen
+                (scenario x generator x period), in the original units.
+        """
+        import numpy as np
+
+        shape = (len(self.gen_names), self.T)
+        solution = {
+            name: np.array(
+                self.model.getAttr(
+                    "X",
+                    [
+                        self.vars[f"{gen}_{name}_{t}"]
+                        for gen in self.gen_names
+                        for t in range(self.T)
+                    ],
+                )
+            ).reshape(shape)
+            for name in ["cap", "inv", "dec"]
+        }
+        solution["gen"] = np.array(
+            self.model.getAttr(
+                "X",
+                [
+                    self.vars[f"{gen}_gen_{t}_{s}"]
+                    for s in range(self.n_scenarios)
+                    for gen in self.gen_names
+                    for t in range(self.T)
+                ],
+            )
+        ).reshape((self.n_scenarios, *shape))
+
+        energy = self.scaling.energy if self.scaling is not None else 1.0
+        return {name: values * energy for name, values in solution.items()}
+
+    def get_objective_value(self) -> float:
+        """Get the objective value in the original cost units.
+
+        For models with several weighted objectives, e.g. one per scenario, the
+        weighted sum of the objectives is returned.
+
+        Returns:
+            float: Objective value.
+        """
+        if self.model.NumObj > 1:
+            obj_val = 0.0
+            for i in range(self.model.NumObj):
+                self.model.setParam("ObjNumber", i)
+                obj_val += self.model.ObjNWeight * self.model.ObjNVal
+        else:
+            obj_val = self.model.objVal
+
+        if self.scaling is not None:
+            return self.scaling.unscale_objective(obj_val)
+        return obj_val
+
+    def get_emissions(self) -> float:
+        """Get the total emissions of the solution.
+
+        Returns:
+            float: Emissions in tonCO2, weighted like the objective if multiple.
+        """
+        energy = self.scaling.energy if self.scaling is not None else 1.0
+        return self.emissions.getValue() * energy
+
+    def set_emission_cap(self, cap: float | None) -> None:
+        """Limit the total emissions of the live model.
+
+        The constraint is added on first use and afterwards only its right-hand
+        side changes, so the next solve is warm started.
+
+        Args:
+            cap (float | None): Maximum emissions in tonCO2. None removes the limit.
+        """
+        energy = self.scaling.energy if self.scaling is not None else 1.0
+        rhs = GRB.INFINITY if cap is None else cap / energy
+        if "emission_cap" not in self.constr:
+            self.constr["emission_cap"] = self.model.addConstr(
+                self.emissions <= rhs, name="emission_cap"
+            )
+        else:
+            self.constr["emission_cap"].RHS = rhs
+
+    def minimize_emissions(self) -> float:
+        """Solve for the lowest achievable emissions.
+
+        The cost objectives are disabled for this solve and restored afterwards.
+
+        Returns:
+            float: Minimum emissions in tonCO2.
+        """
+        if not self.multi_objective:
+            variables = self.model.getVars()
+            costs = self.model.getAttr("Obj", variables)
+            self.model.setObjective(self.emissions)
+            self.model.optimize()
+            if self.model.getAttr("Status") != GRB.OPTIMAL:
+                raise Exception("Optimization was not successful.")
+            emissions = self.get_emissions()
+
+            self.model.setAttr("Obj", variables, costs)
+            self.model.update()
+            return emissions
+
+        n_objectives = self.model.NumObj
+        weights = []
+        for i in range(n_objectives):
+            self.model.setParam("ObjNumber", i)
+            weights.append(self.model.ObjNWeight)
+            self.model.ObjNWeight = 0
+        self.model.setObjectiveN(self.emissions, index=n_objectives, weight=1)
+        self.model.optimize()
+        if self.model.getAttr("Status") != GRB.OPTIMAL:
+            raise Exception("Optimization was not successful.")
+        emissions = self.get_emissions()
+
+        self.model.NumObj = n_objectives
+        for i, weight in enumerate(weights):
+            self.model.setParam("ObjNumber", i)
+            self.model.ObjNWeight = weight
+        self.model.update()
+        return emissions
+
+    def fix_investments(self, results: dict[str, dict[str, list[float]]]) -> None:
+        """Fix the investment and decommissioning decisions to given values.
+
+        The capacities follow from the capacity evolution constraints. Line
+        investments are fixed as well if given.
+
+        Args:
+            results (dict[str, dict[str, list[float]]]): Results as returned by
+                get_results, in the original units.
+        """
+        energy = self.scaling.energy if self.scaling is not None else 1.0
+        for key, name in [("investments", "inv"), ("decommissions", "dec")]:
+            for gen in self.gen_names:
+                for t in range(self.T):
+                    var = self.vars[f"{gen}_{name}_{t}"]
+                    var.LB = var.UB = results[key][gen][t] / energy
+
+        if self.line_names and "line_investments" in results:
+            line_inv = [
+                value / energy
+                for line in self.line_names
+                for value in results["line_investments"][line]
+            ]
+            self.network_vars["line_inv"].LB = line_inv
+            self.network_vars["line_inv"].UB = line_inv
 
     def plot_results(self, scale_factor: float = 1.0) -> None:
         """Plot optimization results."""
+        import matplotlib.pyplot as plt
+        import numpy as np
+
         results, _ = self.get_results()
 
         n_gens = len(self.gen_names)
@@ -0,0 +1,221 @@
+"""Matrix form of the intertemporal expansion model.
+
+Builds the linear program of ``IntertemporalExpansionModel`` (one scenario)
+or ``UncertaintyModel`` (extensive form over all scenarios) directly from the
+``DataModel`` as NumPy arrays and a SciPy sparse constraint matrix, without
+creating per-element solver objects. Memory use is linear in the number of
+nonzeros.
+
+Columns are ordered ``cap``, ``inv``, ``dec`` (generator x period) followed by
+``gen`` (scenario x generator x period). Rows are ordered ``cap_evol``
+(equalities) followed by ``energy_balance``, ``gen_max`` and ``gen_min``
+(greater-or-equal). ``gen_min`` rows with a zero capacity factor are left out
+since they reduce to the lower bound of the generation. Capacities,
+investments and decommissions are bounded as in ``bounds.capacity_bounds``.
+"""
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+try:
+    import scipy.sparse as sp
+except ImportError as e:
+    raise ImportError(
+        "The matrix form requires SciPy, install it with "
+        "pip install 46750_assignment_2[sparse]."
+    ) from e
+
+from assignment_2.model2.arrays import scenario_arrays
+from assignment_2.model2.bounds import capacity_bounds
+from assignment_2.model2.data import INFINITY, DataModel
+from assignment_2.model2.scaling import Scaling
+from assignment_2.solvers.linear_program import LinearProgram
+
+if TYPE_CHECKING:
+    from assignment_2.solvers.pdlp import PDLPResult
+
+
+def build_lp(
+    data: DataModel, discount_factor: float = 1.0, uncertainty: bool = False
+) -> LinearProgram:
+    """Build the linear program of the expansion model.
+
+    The objective matches the model built by ``IntertemporalExpansionModel``:
+    every scenario objective contains the first-stage costs and is weighted
+    with the scenario weight.
+
+    Args:
+        data (DataModel): Data for the optimization model.
+        discount_factor (float, optional): Discount factor for future costs. Defaults to 1.0.
+        uncertainty (bool, optional): Build the extensive form over all
+            scenarios. Defaults to False.
+
+    Returns:
+        LinearProgram: The linear program.
+    """
+    if data.zone_names:
+        raise Exception("The matrix form does not support zonal networks.")
+
+    arrays = scenario_arrays(data, uncertainty=uncertainty)
+    weights = arrays["weights"]
+    S, G, T = arrays["max_cf"].shape  # type: ignore
+    GT = G * T
+    discount = 1 / (1 + discount_factor) ** np.arange(T)
+
+    # Column offsets
+    cap, inv, dec, gen = 0, GT, 2 * GT, 3 * GT
+    n_cols = 3 * GT + S * GT
+    columns = {
+        "cap": (cap, (G, T)),
+        "inv": (inv, (G, T)),
+        "dec": (dec, (G, T)),
+        "gen": (gen, (S, G, T)),
+    }
+    gt = np.arange(GT)
+    sgt = np.arange(S * GT)
+
+    # Objective
+    first_stage_weight = weights.sum()
+    c = np.zeros(n_cols)
+    c[cap : cap + GT] = (
+        first_stage_weight * np.outer(arrays["fixed_opex"], discount).ravel()
+    )
+    c[inv : inv + GT] = first_stage_weight * np.outer(arrays["capex"], discount).ravel()
+    c[dec : dec + GT] = first_stage_weight * np.outer(arrays["decex"], discount).ravel()
+    marginal = arrays["var_opex"] + arrays["co2_price"] * arrays["co2"]
+    c[gen:] = (
+        weights[:, None, None] * marginal[None, :, None] * discount[None, None, :]
+    ).ravel()
+
+    # Capacity evolution: cap_t - cap_{t-1} - inv_t + dec_t = initial capacity at t = 0
+    t_index = gt % T
+    evol_rows = np.concatenate([gt, gt, gt, gt[t_index > 0]])
+    evol_cols = np.concatenate(
+        [cap + gt, inv + gt, dec + gt, cap + gt[t_index > 0] - 1]
+    )
+    evol_vals = np.concatenate(
+        [np.ones(GT), -np.ones(GT), np.ones(GT), -np.ones(int((t_index > 0).sum()))]
+    )
+    evol_b = np.where(t_index == 0, np.repeat(arrays["initial_capacity"], T), 0.0)
+
+    # Energy balance: sum_g gen_{s,g,t} >= load_{s,t}
+    s_index, g_index, t_gen = np.unravel_index(sgt, (S, G, T))
+    balance_rows = GT + s_index * T + t_gen
+    balance_b = arrays["load"].ravel()  # type: ignore
+    n_balance = S * T
+
+    # Generation limits: cf_max * cap - gen >= 0 and gen - cf_min * cap >= 0
+    max_rows = GT + n_balance + sgt
+    max_cf = arrays["max_cf"].ravel()  # type: ignore
+    min_cf = arrays["min_cf"].ravel()  # type: ignore
+    min_mask = min_cf != 0
+    n_min = int(min_mask.sum())
+    min_rows = GT + n_balance + S * GT + np.arange(n_min)
+    cap_of_gen = cap + g_index * T + t_gen
+
+    rows_index = np.concatenate(
+        [evol_rows, balance_rows, max_rows, max_rows, min_rows, min_rows]
+    )
+    cols_index = np.concatenate(
+        [
+            evol_cols,
+            gen + sgt,
+            cap_of_gen,
+            gen + sgt,
+            gen + sgt[min_mask],
+            cap_of_gen[min_mask],
+        ]
+    )
+    values = np.concatenate(
+        [
+            evol_vals,
+            np.ones(S * GT),
+            max_cf,
+            -np.ones(S * GT),
+            np.ones(n_min),
+            -min_cf[min_mask],
+        ]
+    )
+    n_rows = GT + n_balance + S * GT + n_min
+    A = sp.csr_matrix(
+        sp.coo_matrix((values, (rows_index, cols_index)), shape=(n_rows, n_cols))
+    )
+    b = np.concatenate([evol_b, balance_b, np.zeros(S * GT), np.zeros(n_min)])
+
+    lb = np.zeros(n_cols)
+    ub = np.full(n_cols, np.inf)
+    max_capacity = np.where(
+        arrays["max_capacity"] < INFINITY, arrays["max_capacity"], np.inf
+    )
+    ub[cap : cap + GT] = np.repeat(max_capacity, T)
+    bounds = capacity_bounds(data)
+    tightened = np.array([bounds.get(name, np.inf) for name in data.gen_names])
+    ub[cap : cap + GT] = np.minimum(ub[cap : cap + GT], np.repeat(tightened, T))
+    ub[inv : dec + GT] = np.tile(np.repeat(tightened, T), 2)
+
+    rows = {
+        "cap_evol": np.arange(GT),
+        "energy_balance": GT + np.arange(n_balance),
+        "gen_max": GT + n_balance + np.arange(S * GT),
+        "gen_min": min_rows,
+    }
+    return LinearProgram(c, A, b, GT, lb, ub, columns, rows)
+
+
+def get_results(
+    lp: LinearProgram, x: np.ndarray, gen_names: list[str]
+) -> dict[str, dict[str, list[float]]]:
+    """Convert a solution vector to the results format of the models.
+
+    Args:
+        lp (LinearProgram): Linear program the solution belongs to.
+        x (np.ndarray): Solution vector.
+        gen_names (list[str]): Names of the generators.
+
+    Returns:
+        dict[str, dict[str, list[float]]]: Capacities, investments and
+            decommissions per generator and period.
+    """
+    return {
+        name: {gen: lp.get(x, family)[g].tolist() for g, gen in enumerate(gen_names)}
+        for name, family in [
+            ("capacities", "cap"),
+            ("investments", "inv"),
+            ("decommissions", "dec"),
+        ]
+    }
+
+
+def solve_first_order(
+    data: DataModel,
+    discount_factor: float = 1.0,
+    uncertainty: bool = False,
+    scale: bool = True,
+    **options: float | np.ndarray | None,
+) -> tuple[dict[str, dict[str, list[float]]], float, "PDLPResult"]:
+    """Solve the expansion model with the first-order solver.
+
+    Args:
+        data (DataModel): Data for the optimization model.
+        discount_factor (float, optional): Discount factor for future costs. Defaults to 1.0.
+        uncertainty (bool, optional): Solve the extensive form over all
+            scenarios. Defaults to False.
+        scale (bool, optional): Solve in energy and cost units chosen from the
+            data, which the first-order method needs for the Jonas magnitudes.
+            Defaults to True.
+        **options (float | np.ndarray | None): Options of solve_pdlp, e.g.
+            tolerance or the warm start x0 and y0 taken from a previous result.
+
+    Returns:
+        tuple[dict[str, dict[str, list[float]]], float, PDLPResult]: Results and
+            objective value in the original units, and the solver result in the
+            units the problem was solved in.
+    """
+    from assignment_2.solvers.pdlp import solve_pdlp
+
+    scaling = Scaling.from_data(data, discount_factor) if scale else Scaling()
+    lp = build_lp(scaling.scale_data(data), discount_factor, uncertainty)
+    result = solve_pdlp(lp, **options)  # type: ignore
+    results = scaling.unscale_results(get_results(lp, result.x, data.gen_names))
+    return results, scaling.unscale_objective(result.primal_objective), result
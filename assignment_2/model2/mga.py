@@ -0,0 +1,270 @@
+"""Near-optimal alternative capacity plans of the expansion models.
+
+Modelling to generate alternatives: after the least-cost solve, the cost is
+limited to a slack above the optimum and the model is re-solved with
+objectives over the final-year capacities, minimizing and maximizing every
+technology and following random directions. Only the objective changes
+between the solves, so each one is warm started from the previous basis. The
+plans span the range of technology mixes within the cost slack.
+"""
+
+import random
+import tempfile
+from pathlib import Path
+
+from gurobipy import GRB, Constr, LinExpr, Model, Var, read
+
+from assignment_2.model2.intertemporal_expansion_model import (
+    IntertemporalExpansionModel,
+)
+from assignment_2.utils.gurobi_env import get_default_env
+from assignment_2.utils.parallel import map_blocks
+
+
+def _add_cost_slack(model: Model, slack: float) -> Constr:
+    """Limit the cost of a solved model to a slack above its optimum.
+
+    Args:
+        model (Model): Solved Gurobi model with the costs as objective.
+        slack (float): Allowed relative cost increase, e.g. 0.05 for 5 %.
+
+    Returns:
+        Constr: Cost constraint.
+    """
+    variables = model.getVars()
+    costs = model.getAttr("Obj", variables)
+    cost_vars = [var for var, cost in zip(variables, costs, strict=True) if cost != 0]
+    constr = model.addConstr(
+        LinExpr([cost for cost in costs if cost != 0], cost_vars)
+        <= (1 + slack) * model.ObjVal,
+        name="cost_slack",
+    )
+    model.update()
+    return constr
+
+
+def _relax_capacity_bounds(
+    model: IntertemporalExpansionModel,
+) -> tuple[list[Var], list[float]]:
+    """Reset the tightened capacity, investment and decommission bounds.
+
+    The bounds from bounds.capacity_bounds only hold for the least-cost
+    objective and would cut off the plans maximizing a technology, so the
+    capacities are limited by the maximum capacities of the data only.
+
+    Args:
+        model (IntertemporalExpansionModel): Built model.
+
+    Returns:
+        tuple[list[Var], list[float]]: Variables with tightened bounds and their
+            bounds, to restore them afterwards.
+    """
+    variables = []
+    relaxed = []
+    for gen in model.capacity_bounds:
+        for key in ["cap", "inv", "dec"]:
+            variables += [model.vars[f"{gen}_{key}_{t}"] for t in range(model.T)]
+            bound = model.max_capacities[gen] if key == "cap" else GRB.INFINITY
+            relaxed += [bound] * model.T
+    bounds = model.model.getAttr("UB", variables)
+    model.model.setAttr("UB", variables, relaxed)
+    return variables, bounds
+
+
+def _solve_directions(
+    model: Model,
+    cost: Constr,
+    capacities: dict[str, Var],
+    directions: list[dict[str, float]],
+    energy: float,
+    cost_unit: float,
+) -> list[dict[str, object]]:
+    """Solve the model along a sequence of directions over the capacities.
+
+    Args:
+        model (Model): Gurobi model with the cost constraint.
+        cost (Constr): Cost constraint.
+        capacities (dict[str, Var]): Final-year capacity of every generator.
+        directions (list[dict[str, float]]): Objective coefficient of every
+            generator's capacity, minimized.
+        energy (float): Energy unit of the model in MWh.
+        cost_unit (float): Cost unit of the model in DKK.
+
+    Returns:
+        list[dict[str, object]]: Direction, cost and final-year capacities of
+            every plan.
+    """
+    cost_expr = model.getRow(cost)
+    plans = []
+    for direction in directions:
+        model.setObjective(
+            LinExpr(
+                [direction.get(gen, 0.0) for gen in capacities],
+                list(capacities.values()),
+            ),
+            GRB.MINIMIZE,
+        )
+        model.optimize()
+        if model.getAttr("Status") != GRB.OPTIMAL:
+            raise Exception("Optimization was not successful.")
+        plans.append(
+            {
+                "direction": direction,
+                "cost": cost_expr.getValue() * cost_unit,
+                "capacities": {gen: var.X * energy for gen, var in capacities.items()},
+            }
+        )
+    return plans
+
+
+def _solve_file(
+    path: str,
+    cost_index: int,
+    capacity_indices: dict[str, int],
+    energy: float,
+    cost_unit: float,
+    directions: list[dict[str, float]],
+) -> list[dict[str, object]]:
+    """Solve a block of directions on a saved model with the cost constraint.
+
+    Args:
+        path (str): Model file.
+        cost_index (int): Row of the cost constraint.
+        capacity_indices (dict[str, int]): Column of every generator's
+            final-year capacity.
+        energy (float): Energy unit of the model in MWh.
+        cost_unit (float): Cost unit of the model in DKK.
+        directions (list[dict[str, float]]): Directions to solve.
+
+    Returns:
+        list[dict[str, object]]: Plans of the directions.
+    """
+    model = read(path, env=get_default_env())
+    try:
+        variables = model.getVars()
+        return _solve_directions(
+            model,
+            model.getConstrs()[cost_index],
+            {gen: variables[i] for gen, i in capacity_indices.items()},
+            directions,
+            energy,
+            cost_unit,
+        )
+    finally:
+        model.dispose()
+
+
+def _directions(
+    gen_names: list[str], n_random: int, seed: int | None
+) -> list[dict[str, float]]:
+    """Get the minimum and maximum of every generator and random directions.
+
+    Args:
+        gen_names (list[str]): Names of the generators.
+        n_random (int): Number of random directions.
+        seed (int | None): Seed of the random directions.
+
+    Returns:
+        list[dict[str, float]]: Objective coefficient of every generator.
+    """
+    directions = [{gen: sign} for gen in gen_names for sign in [1.0, -1.0]]
+    rng = random.Random(seed)
+    directions += [
+        {gen: rng.uniform(-1, 1) for gen in gen_names} for _ in range(n_random)
+    ]
+    return directions
+
+
+def near_optimal_alternatives(
+    model: IntertemporalExpansionModel,
+    slack: float = 0.05,
+    n_random: int = 10,
+    seed: int | None = 0,
+    max_workers: int = 1,
+) -> tuple[list[dict[str, object]], dict[str, tuple[float, float]]]:
+    """Generate capacity plans within a cost slack of the optimum.
+
+    The tightened capacity bounds of the model are lifted for the alternatives,
+    since they only hold for the least-cost objective. The model is left as it
+    was: the cost constraint is removed, the bounds and the cost objective
+    restored and the least-cost solution re-solved from the last basis
+    afterwards.
+
+    Args:
+        model (IntertemporalExpansionModel): Built and solved model, with one
+            objective.
+        slack (float, optional): Allowed relative cost increase. Defaults to 0.05.
+        n_random (int, optional): Number of random directions besides the
+            minimum and maximum of every generator. Defaults to 10.
+        seed (int | None, optional): Seed of the random directions. Defaults to 0.
+        max_workers (int, optional): Number of worker processes. The model with
+            the cost constraint is saved to a temporary file that every worker
+            loads once and solves a contiguous block of directions on. Defaults
+            to 1, solving everything on the live model in this process.
+
+    Returns:
+        tuple[list[dict[str, object]], dict[str, tuple[float, float]]]: Direction,
+            discounted cost and final-year capacities of the least-cost plan
+            (direction None) and every alternative, and minimum and maximum
+            final-year capacity of every generator over all plans.
+    """
+    if model.multi_objective:
+        raise Exception("Alternatives need a model with a single objective.")
+    if model.model.getAttr("Status") != GRB.OPTIMAL:
+        raise Exception("The model must be solved before generating alternatives.")
+
+    energy = model.scaling.energy if model.scaling is not None else 1.0
+    cost_unit = model.scaling.cost if model.scaling is not None else 1.0
+    capacities = {
+        gen: model.vars[f"{gen}_cap_{model.T - 1}"] for gen in model.gen_names
+    }
+    results, obj_val = model.get_results()
+    plans: list[dict[str, object]] = [
+        {
+            "direction": None,
+            "cost": obj_val,
+            "capacities": {
+                gen: values[-1] for gen, values in results["capacities"].items()
+            },
+        }
+    ]
+
+    variables = model.model.getVars()
+    costs = model.model.getAttr("Obj", variables)
+    cost = _add_cost_slack(model.model, slack)
+    tightened, bounds = _relax_capacity_bounds(model)
+    directions = _directions(model.gen_names, n_random, seed)
+    try:
+        if max_workers <= 1 or len(directions) <= 1:
+            plans += _solve_directions(
+                model.model, cost, capacities, directions, energy, cost_unit
+            )
+        else:
+            capacity_indices = {gen: var.index for gen, var in capacities.items()}
+            with tempfile.TemporaryDirectory() as directory:
+                path = str(Path(directory) / "mga.mps.gz")
+                model.model.write(path)
+                plans += map_blocks(
+                    _solve_file,
+                    directions,
+                    max_workers,
+                    path,
+                    cost.index,
+                    capacity_indices,
+                    energy,
+                    cost_unit,
+                )
+    finally:
+        model.model.remove(cost)
+        model.model.setAttr("UB", tightened, bounds)
+        model.model.setAttr("Obj", variables, costs)
+        model.model.optimize()
+
+    envelope = {
+        gen: (
+            min(plan["capacities"][gen] for plan in plans),  # type: ignore
+            max(plan["capacities"][gen] for plan in plans),  # type: ignore
+        )
+        for gen in model.gen_names
+    }
+    return plans, envelope
@@ -0,0 +1,94 @@
+"""Sparse matrices of the zonal transmission network.
+
+The zonal energy balances of all periods are built as a single matrix
+constraint from the node-line incidence matrix instead of one row at a time.
+Matrices over zone x period rows are Kronecker products of the incidence
+matrices with the identity over the periods, so their size grows linearly
+with zones, lines and periods.
+"""
+
+import numpy as np
+
+try:
+    import scipy.sparse as sp
+except ImportError as e:
+    raise ImportError(
+        "Zonal networks require SciPy, install it with "
+        "pip install 46750_assignment_2[sparse]."
+    ) from e
+
+from assignment_2.model2.data import DataModel
+
+
+def line_incidence(data: DataModel) -> sp.csr_matrix:
+    """Get the node-line incidence matrix.
+
+    Args:
+        data (DataModel): Data with zones and lines.
+
+    Returns:
+        sp.csr_matrix: Zone x line matrix with -1 at the zone a line starts in
+            and 1 at the zone it ends in.
+    """
+    zone_index = {zone: z for z, zone in enumerate(data.zone_names)}
+    n_lines = len(data.line_names)
+    from_zones = [zone_index[data.line_zones[line][0]] for line in data.line_names]
+    to_zones = [zone_index[data.line_zones[line][1]] for line in data.line_names]
+    return sp.csr_matrix(
+        (
+            np.concatenate([-np.ones(n_lines), np.ones(n_lines)]),
+            (from_zones + to_zones, np.tile(np.arange(n_lines), 2)),
+        ),
+        shape=(len(data.zone_names), n_lines),
+    )
+
+
+def generator_incidence(data: DataModel) -> sp.csr_matrix:
+    """Get the matrix locating the generators in the zones.
+
+    Args:
+        data (DataModel): Data with zones and generators assigned to them.
+
+    Returns:
+        sp.csr_matrix: Zone x generator matrix with 1 at the zone of every
+            generator.
+    """
+    zone_index = {zone: z for z, zone in enumerate(data.zone_names)}
+    rows = []
+    for gen in data.gen_names:
+        zone = data.gen_zones.get(gen)
+        if zone not in zone_index:
+            raise Exception(f"Generator {gen} is not located in a known zone.")
+        rows.append(zone_index[zone])
+    n_gens = len(data.gen_names)
+    return sp.csr_matrix(
+        (np.ones(n_gens), (rows, np.arange(n_gens))),
+        shape=(len(data.zone_names), n_gens),
+    )
+
+
+def per_period(matrix: sp.csr_matrix, T: int) -> sp.csr_matrix:
+    """Repeat a matrix for every period.
+
+    Args:
+        matrix (sp.csr_matrix): Matrix over single elements, e.g. zone x line.
+        T (int): Number of periods.
+
+    Returns:
+        sp.csr_matrix: Matrix over element x period rows and columns, ordered
+            with the period changing fastest.
+    """
+    return sp.csr_matrix(sp.kron(matrix, sp.identity(T, format="csr")))
+
+
+def zone_loads(data: DataModel) -> np.ndarray:
+    """Get the load of every zone.
+
+    Args:
+        data (DataModel): Data with zones.
+
+    Returns:
+        np.ndarray: Zone x period load.
+    """
+    shares = np.array([data.zone_load_shares[zone] for zone in data.zone_names])
+    return np.outer(shares, np.array(data.load_series, dtype=float))
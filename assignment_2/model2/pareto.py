@@ -0,0 +1,240 @@
+"""Cost and CO2 emissions Pareto frontier of the expansion models.
+
+The frontier is traced with the epsilon-constraint method: the discounted
+cost is minimized under a cap on the total emissions, and only the cap's
+right-hand side changes between points so every solve is warm started from
+the previous one. Caps are spread evenly between the minimum emissions and
+the emissions of the least-cost solution, and further points are placed
+where the frontier bends the most.
+"""
+
+import copy
+import math
+
+from assignment_2.model2.data import DataModel
+from assignment_2.model2.intertemporal_expansion_model import (
+    IntertemporalExpansionModel,
+)
+from assignment_2.utils.parallel import map_blocks
+
+
+def _build_model(
+    data: DataModel, discount_factor: float, uncertainty: bool, scale: bool
+) -> IntertemporalExpansionModel:
+    """Build the expansion model without solving it.
+
+    Args:
+        data (DataModel): Data for the optimization model. Not modified.
+        discount_factor (float): Discount factor for future costs.
+        uncertainty (bool): Build the UncertaintyModel over all scenarios.
+        scale (bool): Build the model in scaled units.
+
+    Returns:
+        IntertemporalExpansionModel: The built model.
+    """
+    if uncertainty:
+        from assignment_2.model3.uncertainty_model import UncertaintyModel
+
+        model = UncertaintyModel()
+        model.define_uncertainty_model(
+            data=copy.deepcopy(data), discount_factor=discount_factor, scale=scale
+        )
+    else:
+        model = IntertemporalExpansionModel()
+        model.define_model(data=data, discount_factor=discount_factor, scale=scale)
+    return model
+
+
+def _solve_point(
+    model: IntertemporalExpansionModel, cap: float | None
+) -> dict[str, object]:
+    """Solve the live model for one emission cap.
+
+    Args:
+        model (IntertemporalExpansionModel): Built model.
+        cap (float | None): Emission cap in tonCO2, None for no cap.
+
+    Returns:
+        dict[str, object]: Emission cap, cost, emissions and capacities.
+    """
+    model.set_emission_cap(cap)
+    model.optimize()
+    results, obj_val = model.get_results()
+    return {
+        "emission_cap": math.inf if cap is None else cap,
+        "cost": obj_val,
+        "emissions": model.get_emissions(),
+        "capacities": results["capacities"],
+    }
+
+
+def _sweep_caps(
+    data: DataModel,
+    discount_factor: float,
+    uncertainty: bool,
+    scale: bool,
+    caps: list[float],
+) -> list[dict[str, object]]:
+    """Solve a sequence of emission caps on one warm-started model.
+
+    Args:
+        data (DataModel): Data for the optimization model.
+        discount_factor (float): Discount factor for future costs.
+        uncertainty (bool): Use the UncertaintyModel over all scenarios.
+        scale (bool): Build the model in scaled units.
+        caps (list[float]): Emission caps in tonCO2, best given in order.
+
+    Returns:
+        list[dict[str, object]]: Frontier points of the caps.
+    """
+    with _build_model(data, discount_factor, uncertainty, scale) as model:
+        return [_solve_point(model, cap) for cap in caps]
+
+
+def _bends(points: list[dict[str, object]]) -> list[float]:
+    """Get the change in direction of the frontier at every point.
+
+    Costs and emissions are normalized by their ranges so the angles do not
+    depend on units.
+
+    Args:
+        points (list[dict[str, object]]): Frontier points sorted by emissions.
+
+    Returns:
+        list[float]: Angle in radians between the neighbouring segments, zero
+            at the end points.
+    """
+    costs = [p["cost"] for p in points]
+    emissions = [p["emissions"] for p in points]
+    cost_range = (max(costs) - min(costs)) or 1.0  # type: ignore
+    emission_range = (max(emissions) - min(emissions)) or 1.0  # type: ignore
+
+    angles = [
+        math.atan2(
+            (costs[i + 1] - costs[i]) / cost_range,  # type: ignore
+            (emissions[i + 1] - emissions[i]) / emission_range,  # type: ignore
+        )
+        for i in range(len(points) - 1)
+    ]
+    return (
+        [0.0]
+        + [abs(b - a) for a, b in zip(angles[:-1], angles[1:], strict=True)]
+        + [0.0]
+    )
+
+
+def _solve_caps(
+    model: IntertemporalExpansionModel,
+    caps: list[float],
+    data: DataModel,
+    discount_factor: float,
+    uncertainty: bool,
+    scale: bool,
+    max_workers: int,
+) -> list[dict[str, object]]:
+    """Solve emission caps on the live model or in worker processes.
+
+    Args:
+        model (IntertemporalExpansionModel): Live model used without workers.
+        caps (list[float]): Emission caps in tonCO2.
+        data (DataModel): Data for the models built by the workers.
+        discount_factor (float): Discount factor for future costs.
+        uncertainty (bool): Use the UncertaintyModel over all scenarios.
+        scale (bool): Build the models in scaled units.
+        max_workers (int): Number of worker processes.
+
+    Returns:
+        list[dict[str, object]]: Frontier points of the caps.
+    """
+    if max_workers <= 1 or len(caps) <= 1:
+        return [_solve_point(model, cap) for cap in caps]
+
+    return map_blocks(
+        _sweep_caps, caps, max_workers, data, discount_factor, uncertainty, scale
+    )
+
+
+def pareto_frontier(
+    data: DataModel,
+    discount_factor: float = 1.0,
+    n_points: int = 10,
+    n_refinements: int = 10,
+    bend_tolerance: float = 0.05,
+    uncertainty: bool = False,
+    scale: bool = False,
+    max_workers: int = 1,
+) -> list[dict[str, object]]:
+    """Trace the cost and CO2 emissions Pareto frontier.
+
+    Args:
+        data (DataModel): Data for the optimization model. Not modified.
+        discount_factor (float, optional): Discount factor for future costs. Defaults to 1.0.
+        n_points (int, optional): Number of evenly spaced emission caps,
+            including both ends of the frontier. Defaults to 10.
+        n_refinements (int, optional): Maximum number of additional points
+            placed where the frontier bends. Defaults to 10.
+        bend_tolerance (float, optional): Smallest bend in radians, on the
+            normalized frontier, that is refined. Defaults to 0.05.
+        uncertainty (bool, optional): Use the UncertaintyModel with expected
+            cost and emissions over all scenarios. Defaults to False.
+        scale (bool, optional): Build the models in scaled units. Defaults to False.
+        max_workers (int, optional): Number of worker processes. Each worker
+            sweeps a contiguous block of caps on its own model. Defaults to 1,
+            solving everything on a single live model in this process.
+
+    Returns:
+        list[dict[str, object]]: Frontier points sorted by emissions, each with
+            emission cap, discounted cost, emissions and capacities.
+    """
+    model = _build_model(data, discount_factor, uncertainty, scale)
+    least_cost = _solve_point(model, None)
+    min_emissions = model.minimize_emissions()
+    max_emissions = least_cost["emissions"]
+
+    if n_points < 2 or max_emissions - min_emissions <= 0:  # type: ignore
+        model.dispose()
+        return [least_cost]
+
+    step = (max_emissions - min_emissions) / (n_points - 1)  # type: ignore
+    caps = [min_emissions + i * step for i in range(n_points - 1)]
+    points = _solve_caps(
+        model, caps, data, discount_factor, uncertainty, scale, max_workers
+    )
+    points.append(least_cost)
+
+    # Refine where the normalized frontier bends the most
+    n_added = 0
+    while n_added < n_refinements:
+        points.sort(key=lambda p: p["emissions"])  # type: ignore
+        bends = _bends(points)
+        candidates = sorted(
+            (i for i in range(1, len(points) - 1) if bends[i] > bend_tolerance),
+            key=lambda i: bends[i],
+            reverse=True,
+        )[: min(max_workers, n_refinements - n_added)]
+        if not candidates:
+            break
+
+        new_caps = set()
+        for i in candidates:
+            # Bisect the longer of the two segments next to the bend
+            left, right = points[i - 1]["emissions"], points[i + 1]["emissions"]
+            center = points[i]["emissions"]
+            if center - left > right - center:  # type: ignore
+                new_caps.add((left + center) / 2)  # type: ignore
+            else:
+                new_caps.add((center + right) / 2)  # type: ignore
+        points += _solve_caps(
+            model,
+            sorted(new_caps),
+            data,
+            discount_factor,
+            uncertainty,
+            scale,
+            max_workers,
+        )
+        n_added += len(new_caps)
+
+    model.dispose()
+    points.sort(key=lambda p: p["emissions"])  # type: ignore
+    return points
@@ -0,0 +1,232 @@
+"""Numerical scaling of the intertemporal expansion model data.
+
+The raw data mixes energy quantities around 1e7 MWh with costs per MWh
+ranging from 1 to 1e10 DKK. The scaling expresses energy in a unit of
+``energy`` MWh and costs in a unit of ``cost`` DKK, so that right-hand sides
+and objective coefficients are centred around one.
+
+Only the units are changed. This moves the coefficient ranges but does not
+compress them: the ratio between the largest and smallest objective
+coefficient, capital costs against variable costs, stays around 3e10. Row and
+column scaling derived from the ranges is left to the solver, which
+equilibrates the matrix itself (Gurobi's ScaleFlag), so the models keep one
+variable per decision in the units of the data.
+"""
+
+import copy
+import logging
+import math
+
+from assignment_2.model2.data import INFINITY, DataModel
+
+logger = logging.getLogger(__name__)
+
+# Generator data given per unit of energy, i.e. scaled with the energy unit
+ENERGY_KEYS = ["initial_capacity", "max_capacity", "unit_size"]
+# Generator costs given per unit of energy
+COST_KEYS = ["capex", "fixed_opex", "var_opex", "decex"]
+# Transmission line data scaled like the generator data
+LINE_ENERGY_KEYS = ["initial_capacity", "max_capacity"]
+LINE_COST_KEYS = ["capex", "fixed_opex"]
+
+
+def _power_of_ten(value: float) -> float:
+    """Round a positive value to the nearest power of ten.
+
+    Args:
+        value (float): Positive value.
+
+    Returns:
+        float: Nearest power of ten on a logarithmic scale.
+    """
+    return 10.0 ** round(math.log10(value))
+
+
+def _value_range(values: list[float]) -> tuple[float, float]:
+    """Get the range of the absolute nonzero values.
+
+    Args:
+        values (list[float]): Values.
+
+    Returns:
+        tuple[float, float]: Smallest and largest absolute nonzero value.
+    """
+    nonzero = [abs(value) for value in values if value != 0]
+    if not nonzero:
+        return 0.0, 0.0
+    return min(nonzero), max(nonzero)
+
+
+def coefficient_ranges(
+    data: DataModel, discount_factor: float = 1.0
+) -> dict[str, tuple[float, float]]:
+    """Get the coefficient ranges of the model built from the data.
+
+    Args:
+        data (DataModel): Data for the optimization model.
+        discount_factor (float, optional): Discount factor for future costs. Defaults to 1.0.
+
+    Returns:
+        dict[str, tuple[float, float]]: Range of the absolute nonzero matrix,
+            objective, right-hand side and bound values.
+    """
+    discounts = [1 / (1 + discount_factor) ** t for t in range(data.T)]
+    matrix = [1.0]
+    objective = []
+    for gen in data.gen_names:
+        gen_data = data.gen_data[gen]
+        matrix += data.cf_data[gen]["max_cf"] + data.cf_data[gen]["min_cf"]
+        for discount in discounts:
+            objective += [
+                gen_data["capex"] * discount,
+                gen_data["fixed_opex"] * discount,
+                gen_data["decex"] * discount,
+                (gen_data["var_opex"] + data.co2_price * gen_data["co2"]) * discount,
+            ]
+    for line in data.line_names:
+        objective += [
+            data.line_data[line][key] * discount
+            for key in ["capex", "fixed_opex"]
+            for discount in discounts
+        ]
+
+    return {
+        "matrix": _value_range(matrix),
+        "objective": _value_range(objective),
+        "rhs": _value_range(
+            data.load_series
+            + [data.gen_data[gen]["initial_capacity"] for gen in data.gen_names]
+            + [data.line_data[line]["initial_capacity"] for line in data.line_names]
+        ),
+        "bounds": _value_range(
+            [
+                element["max_capacity"]
+                for element in list(data.gen_data.values())
+                + list(data.line_data.values())
+                if element["max_capacity"] < INFINITY
+            ]
+        ),
+    }
+
+
+def _format_ranges(ranges: dict[str, tuple[float, float]]) -> str:
+    """Format coefficient ranges for logging.
+
+    Args:
+        ranges (dict[str, tuple[float, float]]): Coefficient ranges.
+
+    Returns:
+        str: Formatted ranges.
+    """
+    return ", ".join(
+        f"{name} [{low:.0e}, {high:.0e}]" if high > 0 else f"{name} none"
+        for name, (low, high) in ranges.items()
+    )
+
+
+class Scaling:
+    """Units of energy and cost used to build a scaled model."""
+
+    def __init__(self, energy: float = 1.0, cost: float = 1.0) -> None:
+        """Initialize instance.
+
+        Args:
+            energy (float, optional): Energy unit in MWh. Defaults to 1.0.
+            cost (float, optional): Cost unit in DKK. Defaults to 1.0.
+        """
+        self.energy = energy
+        self.cost = cost
+
+    @classmethod
+    def from_data(cls, data: DataModel, discount_factor: float = 1.0) -> "Scaling":
+        """Choose energy and cost units from the magnitudes in the data.
+
+        The energy unit is the power of ten closest to the peak load. The cost
+        unit centres the objective coefficients of the energy scaled model
+        around one on a logarithmic scale. The spread of the coefficients is
+        not reduced, see the module docstring.
+
+        Args:
+            data (DataModel): Data for the optimization model.
+            discount_factor (float, optional): Discount factor for future costs. Defaults to 1.0.
+
+        Returns:
+            Scaling: Scaling for the data.
+        """
+        energy = _power_of_ten(max(data.load_series))
+        low, high = coefficient_ranges(data, discount_factor)["objective"]
+        cost = _power_of_ten(math.sqrt(low * high) * energy) if low > 0 else 1.0
+        scaling = cls(energy=energy, cost=cost)
+
+        logger.info(
+            "Coefficient ranges before scaling: %s",
+            _format_ranges(coefficient_ranges(data, discount_factor)),
+        )
+        logger.info(
+            "Coefficient ranges after scaling (energy unit %.0e MWh, cost unit "
+            "%.0e DKK): %s",
+            energy,
+            cost,
+            _format_ranges(
+                coefficient_ranges(scaling.scale_data(data), discount_factor)
+            ),
+        )
+        return scaling
+
+    def scale_data(self, data: DataModel) -> DataModel:
+        """Create a copy of the data expressed in the scaled units.
+
+        Args:
+            data (DataModel): Data for the optimization model.
+
+        Returns:
+            DataModel: Scaled copy of the data.
+        """
+        scaled = copy.deepcopy(data)
+        scaled.load_series = [load / self.energy for load in data.load_series]
+        scaled.co2_price = data.co2_price * self.energy / self.cost
+        for gen in scaled.gen_names:
+            gen_data = scaled.gen_data[gen]
+            for key in ENERGY_KEYS:
+                if gen_data[key] < INFINITY:
+                    gen_data[key] = gen_data[key] / self.energy
+            for key in COST_KEYS:
+                gen_data[key] = gen_data[key] * self.energy / self.cost
+        for line in scaled.line_names:
+            line_data = scaled.line_data[line]
+            for key in LINE_ENERGY_KEYS:
+                if line_data[key] < INFINITY:
+                    line_data[key] = line_data[key] / self.energy
+            for key in LINE_COST_KEYS:
+                line_data[key] = line_data[key] * self.energy / self.cost
+        return scaled
+
+    def unscale_results(
+        self, results: dict[str, dict[str, list[float]]]
+    ) -> dict[str, dict[str, list[float]]]:
+        """Convert energy results of the scaled model back to MWh.
+
+        Args:
+            results (dict[str, dict[str, list[float]]]): Results of the scaled model.
+
+        Returns:
+            dict[str, dict[str, list[float]]]: Results in the original units.
+        """
+        return {
+            name: {
+                gen: [value * self.energy for value in values]
+                for gen, values in result.items()
+            }
+            for name, result in results.items()
+        }
+
+    def unscale_objective(self, obj_val: float) -> float:
+        """Convert an objective value of the scaled model back to DKK.
+
+        Args:
+            obj_val (float): Objective value of the scaled model.
+
+        Returns:
+            float: Objective value in DKK.
+        """
+        return obj_val * self.cost
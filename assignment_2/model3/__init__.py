@@ -1,7 +1,23 @@
-"""Initialization file for model3 package."""
+"""Initialization file for model3 package.
 
-from assignment_2.model3.uncertainty_model import (
-    UncertaintyModel,
-)
+Public names are imported on first access so that gurobipy is only loaded
+when a model is used.
+"""
+
+from typing import TYPE_CHECKING
+
+from assignment_2.utils.lazy import lazy_getattr
+
+if TYPE_CHECKING:
+    from assignment_2.model3.uncertainty_model import (
+        UncertaintyModel,
+    )
 
 __all__ = ["UncertaintyModel"]
+
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "UncertaintyModel": "assignment_2.model3.uncertainty_model",
+    },
+)
@@ -1,9 +1,80 @@
 """Implementation of optimization model 3."""
 
+import copy
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+from gurobipy import GRB, Env, GurobiError
+
 from assignment_2.model2.data import DataModel
 from assignment_2.model2.intertemporal_expansion_model import (
     IntertemporalExpansionModel,
 )
+from assignment_2.utils.gurobi_env import EnvPool
+
+
+def _solve_deterministic(
+    data: DataModel,
+    discount_factor: float,
+    scale: bool = False,
+    investments: dict[str, dict[str, list[float]]] | None = None,
+    basis: tuple[list[int], list[int]] | None = None,
+    threads: int = 0,
+) -> dict[str, object]:
+    """Solve a deterministic intertemporal expansion problem.
+
+    Module level function so that it can be run in worker processes.
+
+    Args:
+        data (DataModel): Deterministic data of the problem.
+        discount_factor (float): Discount factor for future costs.
+        scale (bool, optional): Build the model in scaled units. Defaults to False.
+        investments (dict[str, dict[str, list[float]]] | None, optional): Results
+            with investments and decommissions to fix. Defaults to None.
+        basis (tuple[list[int], list[int]] | None, optional): Variable and
+            constraint basis of a problem with the same structure, used as warm
+            start. Defaults to None.
+        threads (int, optional): Number of solver threads, 0 for automatic.
+            Defaults to 0.
+
+    Returns:
+        dict[str, object]: Solver status, objective value (infinite if not
+            optimal), results and final basis.
+    """
+    with IntertemporalExpansionModel() as model:
+        model.define_model(data=data, discount_factor=discount_factor, scale=scale)
+        model.model.setParam("Threads", threads)
+        if investments is not None:
+            model.fix_investments(investments)
+        if basis is not None:
+            model.model.setAttr("VBasis", model.model.getVars(), basis[0])
+            model.model.setAttr("CBasis", model.model.getConstrs(), basis[1])
+        model.optimize()
+
+        if model.model.Status != GRB.OPTIMAL:
+            return {
+                "status": model.model.Status,
+                "objective": math.inf,
+                "results": None,
+                "basis": None,
+            }
+
+        results, obj_val = model.get_results()
+        try:
+            final_basis = (
+                model.model.getAttr("VBasis", model.model.getVars()),
+                model.model.getAttr("CBasis", model.model.getConstrs()),
+            )
+        except GurobiError:
+            # No simplex basis, e.g. for multi-objective models or barrier
+            # solves without crossover
+            final_basis = None
+        return {
+            "status": model.model.Status,
+            "objective": obj_val,
+            "results": results,
+            "basis": final_basis,
+        }
 
 
 class UncertaintyModel(IntertemporalExpansionModel):
@@ -12,20 +83,42 @@ class UncertaintyModel(IntertemporalExpansionModel):
     Extending the intertemporal expansion model with uncertainty handling.
     """
 
-    def __init__(self) -> None:
-        """Initialize instance."""
-        super().__init__()
+    def __init__(self, env: Env | EnvPool | None = None) -> None:
+        """Initialize instance.
+
+        Args:
+            env (Env | EnvPool | None, optional): Environment, or pool of
+                environments, for the Gurobi model. Defaults to None, i.e. the
+                environment shared within the process.
+        """
+        super().__init__(env)
 
     def define_uncertainty_model(
         self,
         data: DataModel,
         discount_factor: float = 1.0,
+        scale: bool = False,
+        integer: bool = False,
+        tighten: bool = True,
+        lean: bool = False,
+        multi_objective: bool = False,
     ) -> None:
         """Define the optimization model and its parameters.
 
         Args:
             data (DataModel): Data for the optimization model.
             discount_factor (float, optional): Discount factor for future costs. Defaults to 1.0.
+            scale (bool, optional): Build the model in energy and cost units chosen
+                from the data. Defaults to False.
+            integer (bool, optional): Restrict investments to integer multiples of
+                the generators' unit sizes. Defaults to False.
+            tighten (bool, optional): Bound the capacities, investments and
+                decommissions by the capacity needed to cover the load of any
+                scenario. Defaults to True.
+            lean (bool, optional): Leave out names and the gen_min constraints
+                with a zero capacity factor to reduce memory. Defaults to False.
+            multi_objective (bool, optional): Give every scenario its own weighted
+                objective instead of one expected-cost objective. Defaults to False.
         """
         scenario_weights = data.scenario_weights
         cfs = data.cfs
@@ -39,4 +132,137 @@ class UncertaintyModel(IntertemporalExpansionModel):
                 discount_factor=discount_factor,
                 model_id=i,
                 weight=scenario_weights[i],
+                scale=scale,
+                integer=integer,
+                tighten=tighten,
+                lean=lean,
+                multi_objective=multi_objective,
             )
+
+    def extend_uncertainty_model(self, data: DataModel) -> None:
+        """Append periods and generators to the built model in every scenario.
+
+        Args:
+            data (DataModel): Data with all periods and generators of the built
+                model, in the same order, followed by the new ones.
+        """
+        for i in range(len(data.scenario_weights)):
+            data.set_cf(data.cfs[i])
+            data.scale_load(data.load_factors[i])
+            super().extend(data=data, model_id=i, weight=data.scenario_weights[i])
+
+    def analyze_stochastic_solution(
+        self,
+        data: DataModel,
+        discount_factor: float = 1.0,
+        scale: bool = False,
+        max_workers: int | None = None,
+    ) -> tuple[dict[str, float], list[dict[str, object]]]:
+        """Compare the stochastic solution with deterministic alternatives.
+
+        Solves the recourse problem (this model), the expected value problem,
+        the wait-and-see problem of every scenario and every scenario with the
+        investments fixed to the expected value solution. The scenario solves
+        run in a process pool and are warm started from the basis of the
+        expected value problem.
+
+        The scenario weights are normalized to sum to one, so all values are
+        expected costs on the scale of the deterministic expected value problem.
+
+        The model has no recourse on the capacities, so with the expected value
+        investments fixed the scenarios with a higher load or lower capacity
+        factors than the expected ones are infeasible. EEV is therefore the expected cost over the feasible
+        scenarios only, with their weights normalized, and the number of
+        infeasible scenarios is reported alongside. With infeasible scenarios
+        EEV leaves out the costliest outcomes, so VSS is only indicative and can
+        be negative. EEV and VSS are infinite if no scenario is feasible.
+
+        Args:
+            data (DataModel): Data for the optimization model. Not modified.
+            discount_factor (float, optional): Discount factor for future costs. Defaults to 1.0.
+            scale (bool, optional): Build the models in scaled units. Defaults to False.
+            max_workers (int | None, optional): Number of worker processes.
+                Defaults to None, i.e. the number of CPUs. With 1 the scenario
+                problems are solved in this process.
+
+        Returns:
+            tuple[dict[str, float], list[dict[str, object]]]: Objective values of
+                the recourse problem (RP), the expected value problem (EV), the
+                wait-and-see problem (WS) and the expected result of the
+                expected value solution over the feasible scenarios (EEV),
+                together with EVPI = RP - WS, VSS = EEV - RP and the number of
+                scenarios infeasible with the expected value solution. Per
+                scenario: weight, wait-and-see objective and capacities,
+                feasibility with the expected value solution and its objective,
+                infinite if infeasible.
+        """
+        total_weight = sum(data.scenario_weights)
+        data = copy.deepcopy(data)
+        data.scenario_weights = [
+            weight / total_weight for weight in data.scenario_weights
+        ]
+
+        self.define_uncertainty_model(
+            data=copy.deepcopy(data), discount_factor=discount_factor, scale=scale
+        )
+        self.optimize()
+        _, recourse_problem = self.get_results()
+
+        expected_value = _solve_deterministic(
+            data.get_expected_value(), discount_factor, scale
+        )
+        if expected_value["results"] is None:
+            raise Exception("Expected value problem could not be solved.")
+
+        n_scenarios = len(data.scenario_weights)
+        scenario_data = [data.get_scenario(i) for i in range(n_scenarios)]
+        investments = [None] * n_scenarios + [expected_value["results"]] * n_scenarios
+        tasks = (
+            scenario_data + scenario_data,
+            [discount_factor] * 2 * n_scenarios,
+            [scale] * 2 * n_scenarios,
+            investments,
+            [expected_value["basis"]] * 2 * n_scenarios,
+        )
+        if max_workers == 1:
+            outcomes = list(map(_solve_deterministic, *tasks))
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                outcomes = list(
+                    pool.map(_solve_deterministic, *tasks, [1] * 2 * n_scenarios)
+                )
+
+        scenarios = [
+            {
+                "weight": weight,
+                "wait_and_see": outcomes[i]["objective"],
+                "capacities": (
+                    outcomes[i]["results"]["capacities"]  # type: ignore
+                    if outcomes[i]["results"] is not None
+                    else None
+                ),
+                "feasible": outcomes[n_scenarios + i]["status"] == GRB.OPTIMAL,
+                "expected_value_solution": outcomes[n_scenarios + i]["objective"],
+            }
+            for i, weight in enumerate(data.scenario_weights)
+        ]
+        wait_and_see = sum(s["weight"] * s["wait_and_see"] for s in scenarios)
+        feasible = [s for s in scenarios if s["feasible"]]
+        feasible_weight = sum(s["weight"] for s in feasible)
+        expected_result = (
+            sum(s["weight"] * s["expected_value_solution"] for s in feasible)
+            / feasible_weight
+            if feasible
+            else math.inf
+        )
+
+        summary = {
+            "RP": recourse_problem,
+            "EV": expected_value["objective"],
+            "WS": wait_and_see,
+            "EEV": expected_result,
+            "EVPI": recourse_problem - wait_and_see,
+            "VSS": expected_result - recourse_problem,
+            "infeasible": len(scenarios) - len(feasible),
+        }
+        return summary, scenarios
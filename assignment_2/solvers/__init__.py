@@ -0,0 +1,24 @@
+"""Initialization file for solvers package.
+
+Public names are imported on first access so that SciPy is only loaded when
+a solver is used.
+"""
+
+from typing import TYPE_CHECKING
+
+from assignment_2.utils.lazy import lazy_getattr
+
+if TYPE_CHECKING:
+    from assignment_2.solvers.linear_program import LinearProgram
+    from assignment_2.solvers.pdlp import PDLPResult, solve_pdlp
+
+__all__ = ["LinearProgram", "PDLPResult", "solve_pdlp"]
+
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "LinearProgram": "assignment_2.solvers.linear_program",
+        "PDLPResult": "assignment_2.solvers.pdlp",
+        "solve_pdlp": "assignment_2.solvers.pdlp",
+    },
+)
@@ -0,0 +1,58 @@
+"""Linear program in matrix form shared by the solver backends."""
+
+import numpy as np
+import scipy.sparse as sp
+
+
+class LinearProgram:
+    """Linear program ``min c'x`` s.t. ``A x (=|>=) b`` and ``lb <= x <= ub``.
+
+    The first ``n_eq`` rows of ``A`` are equalities, the remaining rows are
+    greater-or-equal constraints.
+    """
+
+    def __init__(
+        self,
+        c: np.ndarray,
+        A: sp.csr_matrix,
+        b: np.ndarray,
+        n_eq: int,
+        lb: np.ndarray,
+        ub: np.ndarray,
+        columns: dict[str, tuple[int, tuple[int, ...]]],
+        rows: dict[str, np.ndarray],
+    ) -> None:
+        """Initialize instance.
+
+        Args:
+            c (np.ndarray): Objective coefficients.
+            A (sp.csr_matrix): Constraint matrix.
+            b (np.ndarray): Right-hand side.
+            n_eq (int): Number of equality rows at the top of A.
+            lb (np.ndarray): Lower bounds of the variables.
+            ub (np.ndarray): Upper bounds of the variables, np.inf if unbounded.
+            columns (dict[str, tuple[int, tuple[int, ...]]]): Offset and shape of
+                every variable family.
+            rows (dict[str, np.ndarray]): Row indices of every constraint family.
+        """
+        self.c = c
+        self.A = A
+        self.b = b
+        self.n_eq = n_eq
+        self.lb = lb
+        self.ub = ub
+        self.columns = columns
+        self.rows = rows
+
+    def get(self, x: np.ndarray, family: str) -> np.ndarray:
+        """Extract a variable family from a solution vector.
+
+        Args:
+            x (np.ndarray): Solution vector.
+            family (str): Variable family, e.g. "cap" or "gen".
+
+        Returns:
+            np.ndarray: Values of the family in its natural shape.
+        """
+        offset, shape = self.columns[family]
+        return x[offset : offset + int(np.prod(shape))].reshape(shape)
@@ -0,0 +1,353 @@
+"""Matrix-free first-order LP solver.
+
+Primal-dual hybrid gradient method in the style of PDLP for
+
+    min c'x  s.t.  A_eq x = b_eq,  A_ineq x >= b_ineq,  lb <= x <= ub
+
+The constraint matrix is only used through products with vectors, so memory
+use is linear in the number of nonzeros. The method uses Ruiz and
+Pock-Chambolle diagonal preconditioning, restarts to the average iterate
+based on the KKT error, primal weight updates at restarts and warm starts from
+a previous primal and dual solution. Solutions are accurate to the requested
+relative tolerance, which is meant for screening runs rather than exact
+optima.
+"""
+
+import time
+
+import numpy as np
+
+try:
+    import scipy.sparse as sp
+except ImportError as e:
+    raise ImportError(
+        "The first-order solver requires SciPy, install it with "
+        "pip install 46750_assignment_2[sparse]."
+    ) from e
+
+from assignment_2.solvers.linear_program import LinearProgram
+
+# Restart criteria on the KKT error relative to the last restart
+RESTART_SUFFICIENT = 0.2
+RESTART_NECESSARY = 0.8
+RESTART_ARTIFICIAL = 0.36
+# Smoothing of the primal weight update
+PRIMAL_WEIGHT_SMOOTHING = 0.5
+
+
+class PDLPResult:
+    """Result of the first-order solver."""
+
+    def __init__(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        status: str,
+        iterations: int,
+        primal_objective: float,
+        dual_objective: float,
+        primal_residual: float,
+        dual_residual: float,
+        runtime: float,
+        primal_weight: float,
+    ) -> None:
+        """Initialize instance.
+
+        Args:
+            x (np.ndarray): Primal solution.
+            y (np.ndarray): Dual solution, nonnegative for inequality rows.
+            status (str): "optimal", "iteration_limit" or "time_limit".
+            iterations (int): Number of iterations.
+            primal_objective (float): Objective value of x.
+            dual_objective (float): Dual objective value of y.
+            primal_residual (float): Relative primal infeasibility.
+            dual_residual (float): Relative dual infeasibility.
+            runtime (float): Solve time in seconds.
+            primal_weight (float): Final primal weight, to pass on together with
+                a warm start.
+        """
+        self.x = x
+        self.y = y
+        self.status = status
+        self.iterations = iterations
+        self.primal_objective = primal_objective
+        self.dual_objective = dual_objective
+        self.primal_residual = primal_residual
+        self.dual_residual = dual_residual
+        self.runtime = runtime
+        self.primal_weight = primal_weight
+
+    @property
+    def relative_gap(self) -> float:
+        """Relative gap between primal and dual objective."""
+        return abs(self.primal_objective - self.dual_objective) / (
+            1 + abs(self.primal_objective) + abs(self.dual_objective)
+        )
+
+
+class _ScaledProblem:
+    """Diagonally preconditioned problem data with KKT error evaluation."""
+
+    def __init__(self, lp: LinearProgram, ruiz_iterations: int) -> None:
+        """Precondition the linear program.
+
+        Args:
+            lp (LinearProgram): Linear program in the original units.
+            ruiz_iterations (int): Number of Ruiz equilibration passes.
+        """
+        A = lp.A.tocsr().astype(float)
+        n_rows, n_cols = A.shape
+        row_scale = np.ones(n_rows)
+        col_scale = np.ones(n_cols)
+
+        # Ruiz equilibration towards unit infinity norms of rows and columns
+        for _ in range(ruiz_iterations):
+            abs_A = abs(A)
+            row_norm = np.sqrt(abs_A.max(axis=1).toarray().ravel())
+            col_norm = np.sqrt(abs_A.max(axis=0).toarray().ravel())
+            row_norm[row_norm == 0] = 1
+            col_norm[col_norm == 0] = 1
+            A = sp.diags(1 / row_norm) @ A @ sp.diags(1 / col_norm)
+            row_scale /= row_norm
+            col_scale /= col_norm
+
+        # Pock-Chambolle scaling with alpha = 1
+        abs_A = abs(A)
+        row_norm = np.sqrt(np.asarray(abs_A.sum(axis=1)).ravel())
+        col_norm = np.sqrt(np.asarray(abs_A.sum(axis=0)).ravel())
+        row_norm[row_norm == 0] = 1
+        col_norm[col_norm == 0] = 1
+        A = sp.diags(1 / row_norm) @ A @ sp.diags(1 / col_norm)
+        row_scale /= row_norm
+        col_scale /= col_norm
+
+        self.A = sp.csr_matrix(A)
+        self.AT = sp.csr_matrix(A.T)
+        self.row_scale = row_scale
+        self.col_scale = col_scale
+        self.n_eq = lp.n_eq
+        self.c = lp.c * col_scale
+        self.b = lp.b * row_scale
+        self.lb = lp.lb / col_scale
+        self.ub = lp.ub / col_scale
+        self.lp = lp
+        self.b_norm = np.linalg.norm(lp.b)
+        self.c_norm = np.linalg.norm(lp.c)
+
+    def project_primal(self, x: np.ndarray) -> np.ndarray:
+        """Project onto the variable bounds."""
+        return np.clip(x, self.lb, self.ub)
+
+    def project_dual(self, y: np.ndarray) -> np.ndarray:
+        """Project the duals of inequality rows onto the nonnegative orthant."""
+        y[self.n_eq :] = np.maximum(y[self.n_eq :], 0)
+        return y
+
+    def norm_estimate(self, iterations: int = 50) -> float:
+        """Estimate the spectral norm of the scaled matrix by power iteration."""
+        rng = np.random.default_rng(0)
+        v = rng.standard_normal(self.A.shape[1])
+        v /= np.linalg.norm(v)
+        sigma = 1.0
+        for _ in range(iterations):
+            w = self.AT @ (self.A @ v)
+            sigma = np.sqrt(np.linalg.norm(w))
+            if sigma == 0:
+                return 1.0
+            v = w / np.linalg.norm(w)
+        return sigma
+
+    def kkt(self, x: np.ndarray, y: np.ndarray) -> tuple[float, float, float, float]:
+        """Evaluate relative residuals and objectives in the original space.
+
+        Returns:
+            tuple[float, float, float, float]: Relative primal residual,
+                relative dual residual, primal objective and dual objective.
+        """
+        lp = self.lp
+        x_orig = x * self.col_scale
+        y_orig = y * self.row_scale
+
+        activity = lp.A @ x_orig
+        violation = lp.b - activity
+        violation[lp.n_eq :] = np.maximum(violation[lp.n_eq :], 0)
+
+        reduced_cost = lp.c - lp.A.T @ y_orig
+        finite_lb = np.isfinite(lp.lb)
+        finite_ub = np.isfinite(lp.ub)
+        # Reduced costs that cannot be absorbed by a finite bound are infeasible
+        dual_violation = np.where(
+            finite_lb & finite_ub,
+            0,
+            np.where(
+                finite_lb,
+                np.minimum(reduced_cost, 0),
+                np.where(finite_ub, np.maximum(reduced_cost, 0), reduced_cost),
+            ),
+        )
+        positive = np.maximum(reduced_cost, 0)
+        negative = np.minimum(reduced_cost, 0)
+        dual_objective = (
+            lp.b @ y_orig
+            + np.where(finite_lb, lp.lb, 0) @ positive
+            + np.where(finite_ub, lp.ub, 0) @ negative
+        )
+        primal_objective = lp.c @ x_orig
+
+        return (
+            np.linalg.norm(violation) / (1 + self.b_norm),
+            np.linalg.norm(dual_violation) / (1 + self.c_norm),
+            primal_objective,
+            dual_objective,
+        )
+
+    def kkt_error(self, x: np.ndarray, y: np.ndarray, weight: float) -> float:
+        """Weighted KKT error used for restart decisions."""
+        primal, dual, primal_obj, dual_obj = self.kkt(x, y)
+        gap = abs(primal_obj - dual_obj) / (1 + abs(primal_obj) + abs(dual_obj))
+        return np.sqrt(weight * primal**2 + dual**2 / weight + gap**2)
+
+
+def solve_pdlp(
+    lp: LinearProgram,
+    tolerance: float = 1e-4,
+    max_iterations: int = 100_000,
+    time_limit: float = np.inf,
+    x0: np.ndarray | None = None,
+    y0: np.ndarray | None = None,
+    primal_weight: float | None = None,
+    ruiz_iterations: int = 10,
+    check_every: int = 64,
+) -> PDLPResult:
+    """Solve a linear program with restarted primal-dual hybrid gradient.
+
+    Args:
+        lp (LinearProgram): Linear program to solve.
+        tolerance (float, optional): Relative tolerance on primal residual, dual
+            residual and objective gap. Defaults to 1e-4.
+        max_iterations (int, optional): Iteration limit. Defaults to 100_000.
+        time_limit (float, optional): Time limit in seconds. Defaults to no limit.
+        x0 (np.ndarray | None, optional): Primal warm start. Defaults to None.
+        y0 (np.ndarray | None, optional): Dual warm start. Defaults to None.
+        primal_weight (float | None, optional): Initial primal weight, e.g. from
+            the result providing the warm start. Defaults to None, i.e. the
+            ratio of the objective and right-hand side norms.
+        ruiz_iterations (int, optional): Ruiz equilibration passes. Defaults to 10.
+        check_every (int, optional): Iterations between termination and restart
+            checks. Defaults to 64.
+
+    Returns:
+        PDLPResult: Solution and convergence information.
+    """
+    start_time = time.perf_counter()
+    problem = _ScaledProblem(lp, ruiz_iterations)
+    n_rows, n_cols = problem.A.shape
+
+    x = np.zeros(n_cols) if x0 is None else x0 / problem.col_scale
+    y = np.zeros(n_rows) if y0 is None else y0 / problem.row_scale
+    x = problem.project_primal(x)
+    y = problem.project_dual(y)
+
+    step = 0.9 / problem.norm_estimate()
+    c_norm = np.linalg.norm(problem.c)
+    b_norm = np.linalg.norm(problem.b)
+    if primal_weight is not None:
+        weight = primal_weight
+    elif c_norm > 0 and b_norm > 0:
+        weight = c_norm / b_norm
+    else:
+        weight = 1.0
+
+    x_sum, y_sum, n_sum = np.zeros(n_cols), np.zeros(n_rows), 0
+    x_restart, y_restart = x.copy(), y.copy()
+    last_restart_error = problem.kkt_error(x, y, weight)
+    previous_candidate_error = np.inf
+    iterations_since_restart = 0
+    iteration = 0
+    status = "iteration_limit"
+
+    # A warm start may already be optimal
+    primal, dual, primal_obj, dual_obj = problem.kkt(x, y)
+    gap = abs(primal_obj - dual_obj) / (1 + abs(primal_obj) + abs(dual_obj))
+    if max(primal, dual, gap) <= tolerance:
+        max_iterations = 0
+        status = "optimal"
+
+    ATy = problem.AT @ y
+    for iteration in range(1, max_iterations + 1):
+        # Primal-dual hybrid gradient step
+        tau = step / weight
+        sigma = step * weight
+        x_new = problem.project_primal(x - tau * (problem.c - ATy))
+        y_new = problem.project_dual(
+            y + sigma * (problem.b - problem.A @ (2 * x_new - x))
+        )
+        x, y = x_new, y_new
+        ATy = problem.AT @ y
+
+        x_sum += x
+        y_sum += y
+        n_sum += 1
+        iterations_since_restart += 1
+
+        if iteration % check_every:
+            continue
+
+        # Termination on the current iterate
+        primal, dual, primal_obj, dual_obj = problem.kkt(x, y)
+        gap = abs(primal_obj - dual_obj) / (1 + abs(primal_obj) + abs(dual_obj))
+        if max(primal, dual, gap) <= tolerance:
+            status = "optimal"
+            break
+        if time.perf_counter() - start_time > time_limit:
+            status = "time_limit"
+            break
+
+        # Restart to the better of current and average iterate
+        x_avg, y_avg = x_sum / n_sum, y_sum / n_sum
+        error_current = problem.kkt_error(x, y, weight)
+        error_average = problem.kkt_error(x_avg, y_avg, weight)
+        if error_average < error_current:
+            x_candidate, y_candidate, candidate_error = x_avg, y_avg, error_average
+        else:
+            x_candidate, y_candidate, candidate_error = x, y, error_current
+
+        if (
+            candidate_error <= RESTART_SUFFICIENT * last_restart_error
+            or (
+                candidate_error <= RESTART_NECESSARY * last_restart_error
+                and candidate_error > previous_candidate_error
+            )
+            or iterations_since_restart >= RESTART_ARTIFICIAL * iteration
+        ):
+            # Primal weight update from the movement since the last restart
+            delta_x = np.linalg.norm(x_candidate - x_restart)
+            delta_y = np.linalg.norm(y_candidate - y_restart)
+            if delta_x > 1e-10 and delta_y > 1e-10:
+                weight = np.exp(
+                    PRIMAL_WEIGHT_SMOOTHING * np.log(delta_y / delta_x)
+                    + (1 - PRIMAL_WEIGHT_SMOOTHING) * np.log(weight)
+                )
+            x, y = x_candidate.copy(), y_candidate.copy()
+            ATy = problem.AT @ y
+            x_restart, y_restart = x.copy(), y.copy()
+            x_sum, y_sum, n_sum = np.zeros(n_cols), np.zeros(n_rows), 0
+            last_restart_error = problem.kkt_error(x, y, weight)
+            previous_candidate_error = np.inf
+            iterations_since_restart = 0
+        else:
+            previous_candidate_error = candidate_error
+
+    primal, dual, primal_obj, dual_obj = problem.kkt(x, y)
+    return PDLPResult(
+        x=x * problem.col_scale,
+        y=y * problem.row_scale,
+        status=status,
+        iterations=iteration,
+        primal_objective=primal_obj,
+        dual_objective=dual_obj,
+        primal_residual=primal,
+        dual_residual=dual,
+        runtime=time.perf_counter() - start_time,
+        primal_weight=weight,
+    )
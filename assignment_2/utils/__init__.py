@@ -0,0 +1,22 @@
+"""Initialization file for utils package.
+
+Public names are imported on first access to keep package import cheap.
+"""
+
+from typing import TYPE_CHECKING
+
+from assignment_2.utils.lazy import lazy_getattr
+
+if TYPE_CHECKING:
+    from assignment_2.utils.sweep_writer import SweepReader, SweepWriter, fingerprint
+
+__all__ = ["SweepReader", "SweepWriter", "fingerprint"]
+
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "SweepReader": "assignment_2.utils.sweep_writer",
+        "SweepWriter": "assignment_2.utils.sweep_writer",
+        "fingerprint": "assignment_2.utils.sweep_writer",
+    },
+)
@@ -0,0 +1,201 @@
+"""Shared Gurobi environments and deterministic model disposal.
+
+Creating a Gurobi model on the default environment for every rebuild and
+leaving the old model to the garbage collector lets native memory grow over
+long sweeps. Models built through ``GurobiModel`` share an environment and
+dispose the previous Gurobi model as soon as it is replaced.
+
+Gurobi environments must not be shared across a fork, so a forked worker
+process leaves the shared environment of its parent alone and creates its own.
+"""
+
+import os
+import threading
+from types import TracebackType
+
+from gurobipy import Env, Model
+
+_default_env: Env | None = None
+_default_env_lock = threading.Lock()
+# Environments of the parent process, kept referenced in a forked child so that
+# the child never frees them
+_inherited_envs: list[Env] = []
+
+
+def _create_env(params: dict[str, int | float | str] | None = None) -> Env:
+    """Create and start a silent Gurobi environment.
+
+    Args:
+        params (dict[str, int | float | str] | None, optional): Parameters set
+            on the environment before it is started. Defaults to None.
+
+    Returns:
+        Env: Started environment.
+    """
+    env = Env(empty=True)
+    env.setParam("OutputFlag", 0)
+    for name, value in (params or {}).items():
+        env.setParam(name, value)
+    env.start()
+    return env
+
+
+def get_default_env() -> Env:
+    """Get the environment shared by all models of this process.
+
+    Returns:
+        Env: Shared environment, created on first use in every process.
+    """
+    global _default_env
+    with _default_env_lock:
+        if _default_env is None:
+            _default_env = _create_env()
+        return _default_env
+
+
+def _reset_after_fork() -> None:
+    """Drop the shared environment of the parent in a forked child."""
+    global _default_env, _default_env_lock
+    if _default_env is not None:
+        _inherited_envs.append(_default_env)
+    _default_env = None
+    _default_env_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class EnvPool:
+    """Pool of Gurobi environments handed out to models.
+
+    Environments are created on demand up to ``size`` and reused after being
+    released. Acquiring from an exhausted pool blocks until an environment is
+    released.
+    """
+
+    def __init__(
+        self, size: int = 1, params: dict[str, int | float | str] | None = None
+    ) -> None:
+        """Initialize instance.
+
+        Args:
+            size (int, optional): Maximum number of environments. Defaults to 1.
+            params (dict[str, int | float | str] | None, optional): Parameters
+                for every environment, e.g. ``{"Threads": 1}``. Defaults to None.
+        """
+        self.size = size
+        self.params = params
+        self.envs: list[Env] = []
+        self.free: list[Env] = []
+        self.condition = threading.Condition()
+
+    def __enter__(self) -> "EnvPool":
+        """Enter context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Dispose all environments when leaving the context manager."""
+        self.close()
+
+    def acquire(self) -> Env:
+        """Take an environment from the pool.
+
+        Returns:
+            Env: Environment for exclusive use until released.
+        """
+        with self.condition:
+            while not self.free and len(self.envs) >= self.size:
+                self.condition.wait()
+            if self.free:
+                return self.free.pop()
+            env = _create_env(self.params)
+            self.envs.append(env)
+            return env
+
+    def release(self, env: Env) -> None:
+        """Return an environment to the pool.
+
+        Args:
+            env (Env): Environment taken with acquire.
+        """
+        with self.condition:
+            self.free.append(env)
+            self.condition.notify()
+
+    def close(self) -> None:
+        """Dispose all environments of the pool."""
+        with self.condition:
+            for env in self.envs:
+                env.dispose()
+            self.envs = []
+            self.free = []
+
+
+class GurobiModel:
+    """Base class for models owning a Gurobi model.
+
+    The Gurobi model is disposed when it is replaced, when dispose is called,
+    or when leaving the context manager.
+    """
+
+    def __init__(self, env: Env | EnvPool | None = None) -> None:
+        """Initialize instance.
+
+        Args:
+            env (Env | EnvPool | None, optional): Environment to build models in,
+                or pool to take one from until the model is disposed. Defaults to
+                None, i.e. the environment shared within the process.
+        """
+        self.env_pool = env if isinstance(env, EnvPool) else None
+        self.env: Env | None = env if isinstance(env, Env) else None
+
+    def __enter__(self) -> "GurobiModel":
+        """Enter context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Dispose the model when leaving the context manager."""
+        self.dispose()
+
+    def new_model(self, name: str) -> Model:
+        """Dispose the current Gurobi model and create a new one.
+
+        Args:
+            name (str): Name of the new model.
+
+        Returns:
+            Model: New empty model with output disabled.
+        """
+        self.dispose_model()
+        if self.env is None:
+            self.env = (
+                self.env_pool.acquire()
+                if self.env_pool is not None
+                else get_default_env()
+            )
+        self.model = Model(name, env=self.env)
+        self.model.setParam("OutputFlag", 0)
+        return self.model
+
+    def dispose_model(self) -> None:
+        """Free the native memory of the current Gurobi model."""
+        model = self.__dict__.pop("model", None)
+        if model is not None:
+            model.dispose()
+
+    def dispose(self) -> None:
+        """Dispose the Gurobi model and return a pooled environment."""
+        self.dispose_model()
+        if self.env_pool is not None and self.env is not None:
+            self.env_pool.release(self.env)
+            self.env = None
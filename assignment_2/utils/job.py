@@ -0,0 +1,540 @@
+"""Declarative sweep jobs for the batch command line interface.
+
+A job is described in a TOML file:
+
+    [job]
+    dataset = "jonas"  # "jonas", "freja" or path to a dataset TOML file
+    model = "IntertemporalExpansionModel"
+    discount_factor = 0.05
+    output = "results/conv_sweep"
+    integer = true  # optional, investments in whole units
+    mip_gap = 0.01  # optional, stop integer solves at this gap
+    time_limit = 60  # optional, seconds per integer solve
+
+    [sweep]
+    conv_max_factor = { start = 0.0, stop = 2.0, step = 0.01 }
+    renewable_max_factor = [1.0, 2.0]
+
+The sweep grid is the cartesian product of all sweep parameters. A dataset
+file holds the arguments of the data class methods:
+
+    load_series = [36e6, 37.1e6]  # "load" for the LCOEModel
+    co2_price = 32.6
+
+    zones = { DK1 = 0.6, DK2 = 0.4 }  # optional, shares of the load
+
+    [generators."Offshore Wind"]
+    capex = 23038800000
+    initial_capacity = 21628440
+    zone = "DK1"
+
+    [lines."Great Belt"]
+    from_zone = "DK1"
+    to_zone = "DK2"
+    initial_capacity = 5256000
+
+    [[scenarios]]
+    weight = 1.0
+    load_factor = 1.0
+    cf = { "Offshore Wind" = 0.41 }
+"""
+
+import importlib
+import itertools
+import tomllib
+from collections.abc import Iterator, Mapping
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, cast
+
+if TYPE_CHECKING:
+    from assignment_2.model1 import DataModel1, LCOEModel
+    from assignment_2.model2 import DataModel, IntertemporalExpansionModel
+    from assignment_2.model2.artifact import ModelArtifact
+    from assignment_2.model3 import UncertaintyModel
+
+# Package of the model class, and package and name of its data class
+MODELS = {
+    "LCOEModel": ("assignment_2.model1", "assignment_2.model1", "DataModel1"),
+    "IntertemporalExpansionModel": (
+        "assignment_2.model2",
+        "assignment_2.model2",
+        "DataModel",
+    ),
+    "UncertaintyModel": ("assignment_2.model3", "assignment_2.model2", "DataModel"),
+}
+
+DATASETS = {
+    "freja": "DataModel1",
+    "jonas": "DataModel",
+}
+
+
+def _parse_values(name: str, spec: list[float] | dict[str, float] | float) -> list:
+    """Expand the values of a sweep parameter.
+
+    Args:
+        name (str): Name of the sweep parameter.
+        spec (list[float] | dict[str, float] | float): List of values, single value
+            or range given by ``start``, ``stop`` (exclusive) and ``step``.
+
+    Returns:
+        list: Values of the sweep parameter.
+    """
+    if isinstance(spec, list):
+        return spec
+    if isinstance(spec, int | float):
+        return [spec]
+    if isinstance(spec, dict) and {"start", "stop", "step"} <= set(spec):
+        n_values = int(round((spec["stop"] - spec["start"]) / spec["step"]))
+        return [spec["start"] + i * spec["step"] for i in range(n_values)]
+    raise Exception(f"Invalid values for sweep parameter {name}: {spec}.")
+
+
+class Job:
+    """Sweep job read from a TOML file."""
+
+    def __init__(
+        self,
+        dataset: str,
+        model: str,
+        output: str | Path,
+        discount_factor: float = 1.0,
+        sweep: dict[str, list[float]] | None = None,
+        options: dict[str, Any] | None = None,
+    ) -> None:
+        """Initialize instance.
+
+        Args:
+            dataset (str): "jonas", "freja" or path to a dataset TOML file.
+            model (str): Name of the model class.
+            output (str | Path): Directory for the sweep results.
+            discount_factor (float, optional): Discount factor for future costs.
+                Defaults to 1.0.
+            sweep (dict[str, list[float]] | None, optional): Values of each
+                sweep parameter. Defaults to None, i.e. a single point.
+            options (dict[str, Any] | None, optional): Further keyword
+                arguments for the model definition. Defaults to None.
+        """
+        if model not in MODELS:
+            raise Exception(f"Unknown model {model}. Choose from {list(MODELS)}.")
+        self.dataset = dataset
+        self.model = model
+        self.output = Path(output)
+        self.discount_factor = discount_factor
+        self.sweep = sweep or {}
+        self.options = options or {}
+        self.start: dict[str, float] | None = None
+
+    @classmethod
+    def from_toml(cls, path: str | Path) -> "Job":
+        """Read a job from a TOML file.
+
+        A relative dataset path is resolved against the job file.
+
+        Args:
+            path (str | Path): Path to the job file.
+
+        Returns:
+            Job: The job described by the file.
+        """
+        path = Path(path)
+        with path.open("rb") as f:
+            content = tomllib.load(f)
+
+        job = dict(content["job"])
+        dataset = job.pop("dataset")
+        if dataset not in DATASETS:
+            dataset = str(path.parent / dataset)
+        return cls(
+            dataset=dataset,
+            model=job.pop("model"),
+            output=job.pop("output"),
+            discount_factor=job.pop("discount_factor", 1.0),
+            sweep={
+                name: _parse_values(name, spec)
+                for name, spec in content.get("sweep", {}).items()
+            },
+            options=job,
+        )
+
+    def points(self) -> list[dict[str, float]]:
+        """Get the sweep grid.
+
+        Returns:
+            list[dict[str, float]]: Parameter values of every grid point.
+        """
+        names = list(self.sweep)
+        return [
+            dict(zip(names, values, strict=True))
+            for values in itertools.product(*(self.sweep[name] for name in names))
+        ]
+
+    def load_data(self) -> "DataModel | DataModel1":
+        """Create a fresh data instance for the job's dataset.
+
+        Returns:
+            DataModel | DataModel1: Data of the job's model class.
+        """
+        _, data_package, data_class = MODELS[self.model]
+        data = getattr(importlib.import_module(data_package), data_class)()
+
+        if self.dataset in DATASETS:
+            if DATASETS[self.dataset] != data_class:
+                raise Exception(
+                    f"Dataset {self.dataset} cannot be used with {self.model}."
+                )
+            getattr(data, self.dataset)()
+            return data
+
+        with Path(self.dataset).open("rb") as f:
+            content = tomllib.load(f)
+        if "load" in content:
+            data.add_load(content["load"])
+        if "load_series" in content:
+            data.add_load_series(content["load_series"])
+        data.add_co2_price(content.get("co2_price", 0))
+        for zone, load_share in content.get("zones", {}).items():
+            data.add_zone(zone_name=zone, load_share=load_share)
+        for line, kwargs in content.get("lines", {}).items():
+            data.add_line(line_name=line, **kwargs)
+        for gen, kwargs in content.get("generators", {}).items():
+            data.add_generator(gen_name=gen, **kwargs)
+        if "scenarios" in content:
+            data.set_scenario_factors(
+                scenario_weights=[s["weight"] for s in content["scenarios"]],
+                cfs=[s.get("cf", {}) for s in content["scenarios"]],
+                load_factors=[s.get("load_factor", 1.0) for s in content["scenarios"]],
+            )
+        return data
+
+    def point_data(
+        self, point: dict[str, float]
+    ) -> tuple["DataModel | DataModel1", float]:
+        """Create the data of a single point of the sweep grid.
+
+        Args:
+            point (dict[str, float]): Parameter values of the point.
+
+        Returns:
+            tuple[DataModel | DataModel1, float]: Data instance with the
+                parameters applied and discount factor of the point.
+        """
+        data = self.load_data()
+        for name, value in point.items():
+            _apply_parameter(data, name, value)
+        return data, point.get("discount_factor", self.discount_factor)
+
+    def solve_point(
+        self,
+        model: "IntertemporalExpansionModel | UncertaintyModel | LCOEModel",
+        point: dict[str, float],
+        overrides: Mapping[str, object] | None = None,
+    ) -> dict[str, float]:
+        """Solve a single point of the sweep grid.
+
+        Args:
+            model (IntertemporalExpansionModel | UncertaintyModel | LCOEModel):
+                Model instance created by create_model, rebuilt for every point.
+            point (dict[str, float]): Parameter values of the point.
+            overrides (Mapping[str, object] | None, optional): Options replacing the
+                job options for this point, e.g. ``lean`` or ``n_scenarios`` to
+                keep only the most likely scenarios. Defaults to None.
+
+        Returns:
+            dict[str, float]: Parameter values, objective value and capacity of
+                every generator in the final period (generation for the
+                ``LCOEModel``). Expansion models add the columns of
+                _size_columns.
+        """
+        from assignment_2.model1.data import DataModel1
+        from assignment_2.model1.lcoe_model import LCOEModel
+        from assignment_2.model3.uncertainty_model import UncertaintyModel
+
+        data, discount_factor = self.point_data(point)
+        options: dict[str, Any] = {**self.options, **(overrides or {})}
+        size = _size_columns(options)
+        n_scenarios = options.pop("n_scenarios", None)
+
+        if isinstance(model, LCOEModel) and isinstance(data, DataModel1):
+            model.define_model(data=data, **options)
+            model.optimize()
+            lcoe_results = model.get_results()
+            return {
+                **point,
+                "objective": cast(float, lcoe_results["objective_value"]),
+                **cast(dict[str, float], lcoe_results["generation"]),
+            }
+        if isinstance(model, LCOEModel) or isinstance(data, DataModel1):
+            raise Exception(f"The model is not an instance of {self.model}.")
+
+        if n_scenarios is not None:
+            data = data.reduce_scenarios(n_scenarios)
+        mip_gap = options.pop("mip_gap", None)
+        time_limit = options.pop("time_limit", None)
+        if isinstance(model, UncertaintyModel):
+            model.define_uncertainty_model(
+                data=data, discount_factor=discount_factor, **options
+            )
+        else:
+            model.define_model(data=data, discount_factor=discount_factor, **options)
+        if options.get("integer", False):
+            # Start from the incumbent of the previous point of the shard
+            model.optimize_integer(
+                mip_gap=mip_gap, time_limit=time_limit, start=self.start
+            )
+            self.start = model.get_start() or None
+        else:
+            model.optimize()
+        results, obj_val = model.get_results()
+        return {
+            **point,
+            "objective": obj_val,
+            **{
+                gen: capacities[-1] for gen, capacities in results["capacities"].items()
+            },
+            **size,
+        }
+
+    def compile_artifact(self, directory: str | Path) -> Path:
+        """Build the model of the job's dataset once and save it as an artifact.
+
+        Args:
+            directory (str | Path): Directory for the artifact.
+
+        Returns:
+            Path: Directory of the artifact.
+        """
+        from assignment_2.model2.artifact import compile_model
+        from assignment_2.model2.data import DataModel
+
+        if "discount_factor" in self.sweep:
+            raise Exception("Jobs sweeping the discount factor cannot be compiled.")
+        data = self.load_data()
+        if not isinstance(data, DataModel):
+            raise Exception("Only expansion models can be compiled.")
+
+        options = dict(self.options)
+        n_scenarios = options.pop("n_scenarios", None)
+        if n_scenarios is not None:
+            data = data.reduce_scenarios(n_scenarios)
+        options.pop("mip_gap", None)
+        options.pop("time_limit", None)
+        return compile_model(
+            data,
+            directory,
+            discount_factor=self.discount_factor,
+            uncertainty=self.model == "UncertaintyModel",
+            **options,
+        )
+
+    def solve_artifact_point(
+        self, artifact: "ModelArtifact", point: dict[str, float]
+    ) -> dict[str, float]:
+        """Solve a single point of the sweep grid on a compiled model.
+
+        Args:
+            artifact (ModelArtifact): Model compiled by compile_artifact.
+            point (dict[str, float]): Parameter values of the point.
+
+        Returns:
+            dict[str, float]: Parameter values, objective value, capacity of
+                every generator in the final period and the columns of
+                _size_columns.
+        """
+        for name, value in point.items():
+            _apply_artifact_parameter(artifact, name, value)
+        for param, key in [("MIPGap", "mip_gap"), ("TimeLimit", "time_limit")]:
+            if key in self.options:
+                artifact.model.setParam(param, self.options[key])
+        artifact.optimize()
+        results, obj_val = artifact.get_results()
+        return {
+            **point,
+            "objective": obj_val,
+            **{
+                gen: capacities[-1] for gen, capacities in results["capacities"].items()
+            },
+            **_size_columns(self.options),
+        }
+
+    def create_model(
+        self,
+    ) -> "IntertemporalExpansionModel | UncertaintyModel | LCOEModel":
+        """Create an instance of the job's model class.
+
+        Returns:
+            IntertemporalExpansionModel | UncertaintyModel | LCOEModel: Model
+                instance.
+        """
+        package, _, _ = MODELS[self.model]
+        return getattr(importlib.import_module(package), self.model)()
+
+
+def _size_columns(options: Mapping[str, object]) -> dict[str, float]:
+    """Get the result columns recording the size of the solved model.
+
+    Points downsized to fit in a memory budget are solved in lean mode or with
+    fewer scenarios, and a model with fewer scenarios is a different model, so
+    readers of the results must be able to tell these points apart.
+
+    Args:
+        options (Mapping[str, object]): Options of the point.
+
+    Returns:
+        dict[str, float]: ``n_scenarios``, the number of scenarios kept or 0 for
+            all, and ``lean``, 1 in lean mode and 0 otherwise.
+    """
+    n_scenarios = options.get("n_scenarios")
+    return {
+        "n_scenarios": float(n_scenarios) if isinstance(n_scenarios, int) else 0.0,
+        "lean": float(bool(options.get("lean", False))),
+    }
+
+
+def _apply_parameter(data: "DataModel | DataModel1", name: str, value: float) -> None:
+    """Apply a sweep parameter to a data instance.
+
+    Args:
+        data (DataModel | DataModel1): Data of the point.
+        name (str): Name of the sweep parameter.
+        value (float): Value of the sweep parameter.
+    """
+    from assignment_2.model2.data import DataModel
+
+    if name == "discount_factor":
+        return
+    if name == "co2_price":
+        data.add_co2_price(value)
+    elif name not in ["conv_max_factor", "renewable_max_factor", "load_factor"]:
+        raise Exception(f"Unknown sweep parameter {name}.")
+    elif not isinstance(data, DataModel):
+        raise Exception(f"Sweep parameter {name} needs an expansion model.")
+    elif name == "conv_max_factor":
+        data.jonas_max_capacity_change(conv_max_factor=value)
+    elif name == "renewable_max_factor":
+        data.jonas_max_capacity_change(renewable_max_factor=value)
+    else:
+        data.scale_load(value)
+        # The UncertaintyModel sets the load of every scenario from its own
+        # load factor, which would replace the swept one
+        data.load_factors = [factor * value for factor in data.load_factors]
+
+
+def _apply_artifact_parameter(
+    artifact: "ModelArtifact", name: str, value: float
+) -> None:
+    """Apply a sweep parameter to a compiled model, like _apply_parameter.
+
+    Args:
+        artifact (ModelArtifact): Compiled model.
+        name (str): Name of the sweep parameter.
+        value (float): Value of the sweep parameter.
+    """
+    generators = artifact.generators
+    if name in ["conv_max_factor", "renewable_max_factor"]:
+        for gen, gen_index in generators.items():
+            if (gen_index["co2"] > 0) == (name == "conv_max_factor"):
+                artifact.set_max_capacity(gen, gen_index["initial_capacity"] * value)
+    elif name == "co2_price":
+        artifact.set_co2_price(value)
+    elif name == "load_factor":
+        artifact.scale_load(value)
+    else:
+        raise Exception(f"Unknown sweep parameter {name}.")
+
+
+_worker_artifact: "ModelArtifact | None" = None
+
+
+def _load_worker_artifact(directory: str) -> None:
+    """Load the artifact of a worker process once, before its first point.
+
+    Args:
+        directory (str): Directory of the artifact.
+    """
+    from assignment_2.model2.artifact import ModelArtifact
+
+    global _worker_artifact
+    _worker_artifact = ModelArtifact(directory)
+
+
+def _solve_worker_point(
+    job: Job, point_id: str, point: dict[str, float]
+) -> tuple[str, dict[str, float]]:
+    """Solve a point on the artifact of the worker process.
+
+    Args:
+        job (Job): Sweep job.
+        point_id (str): Identifier of the point.
+        point (dict[str, float]): Parameter values of the point.
+
+    Returns:
+        tuple[str, dict[str, float]]: Identifier and result of the point.
+    """
+    if _worker_artifact is None:
+        raise Exception("The artifact of the worker process is not loaded.")
+    return point_id, job.solve_artifact_point(_worker_artifact, point)
+
+
+def solve_artifact_points(
+    job: Job,
+    directory: str | Path,
+    points: list[tuple[str, dict[str, float]]],
+    workers: int = 1,
+) -> Iterator[tuple[str, dict[str, float]]]:
+    """Solve points on a compiled model, loaded once per worker process.
+
+    Args:
+        job (Job): Sweep job.
+        directory (str | Path): Directory of the artifact.
+        points (list[tuple[str, dict[str, float]]]): Identifier and parameter
+            values of every point.
+        workers (int, optional): Number of worker processes. Defaults to 1,
+            i.e. solving in this process.
+
+    Yields:
+        tuple[str, dict[str, float]]: Identifier and result of every point in
+            order of completion.
+    """
+    if workers <= 1:
+        from assignment_2.model2.artifact import ModelArtifact
+
+        with ModelArtifact(directory) as artifact:
+            for point_id, point in points:
+                yield point_id, job.solve_artifact_point(artifact, point)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_load_worker_artifact,
+        initargs=(str(directory),),
+    ) as pool:
+        futures = [
+            pool.submit(_solve_worker_point, job, point_id, point)
+            for point_id, point in points
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def shard_points(
+    points: list[dict[str, float]], index: int, count: int
+) -> list[tuple[int, dict[str, float]]]:
+    """Select the points of a shard.
+
+    Points are dealt round-robin so that shards get a similar mix of cheap and
+    expensive points.
+
+    Args:
+        points (list[dict[str, float]]): All points of the sweep grid.
+        index (int): Index of the shard, from 0 to ``count - 1``.
+        count (int): Number of shards.
+
+    Returns:
+        list[tuple[int, dict[str, float]]]: Grid index and parameter values of the
+            points in the shard.
+    """
+    if not 0 <= index < count:
+        raise Exception(f"Shard index {index} is not in range 0 to {count - 1}.")
+    return [(i, point) for i, point in enumerate(points) if i % count == index]
@@ -0,0 +1,24 @@
+"""Helpers for importing heavy dependencies on first use."""
+
+import importlib
+from collections.abc import Callable
+
+
+def lazy_getattr(package: str, lazy_imports: dict[str, str]) -> Callable[[str], object]:
+    """Create a module level ``__getattr__`` that imports names on first access.
+
+    Args:
+        package (str): Name of the package the ``__getattr__`` belongs to.
+        lazy_imports (dict[str, str]): Mapping from public name to the module
+            defining it.
+
+    Returns:
+        Callable[[str], object]: Function to assign to ``__getattr__`` of the package.
+    """
+
+    def import_attribute(name: str) -> object:
+        if name not in lazy_imports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        return getattr(importlib.import_module(lazy_imports[name]), name)
+
+    return import_attribute
@@ -0,0 +1,360 @@
+"""Memory estimation and admission control for concurrent model solves.
+
+The memory of an expansion model is dominated by the per-element Python and
+Gurobi objects, so it is estimated from the number of nonzeros following
+from the ``DataModel`` dimensions. Every solve in a worker process measures
+its peak RSS, which refines the estimate for the following jobs.
+
+``MemoryBudgetRunner`` solves sweep points in worker processes and only
+starts a point when its estimate fits in the remaining budget. Points that
+do not fit even on an idle node are downsized: first to lean mode, then to
+fewer scenarios. The ``n_scenarios`` and ``lean`` columns of the results
+record the downsizing.
+"""
+
+import json
+import logging
+import os
+import resource
+import sys
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+
+from assignment_2.model2.data import DataModel
+from assignment_2.utils.job import Job
+
+logger = logging.getLogger(__name__)
+
+# Bytes per nonzero measured when building replicated Jonas scenarios, with
+# a margin for the solver's working memory
+BYTES_PER_NONZERO = 600.0
+# Fixed working memory of a solve
+SOLVER_OVERHEAD = 10e6
+# RSS of a worker process with gurobipy and NumPy imported
+BASE_BYTES = 100e6
+# Weight of a new measurement of the worker RSS
+SMOOTHING = 0.3
+# Number of recent solves the per-nonzero cost is fitted to
+MAX_OBSERVATIONS = 50
+
+
+def model_dimensions(
+    data: DataModel,
+    uncertainty: bool = False,
+    lean: bool = False,
+    n_scenarios: int | None = None,
+) -> dict[str, int]:
+    """Count the variables, constraints and nonzeros of an expansion model.
+
+    Args:
+        data (DataModel): Data for the optimization model.
+        uncertainty (bool, optional): Count the UncertaintyModel over all
+            scenarios. Defaults to False.
+        lean (bool, optional): Count the model built in lean mode. Defaults to False.
+        n_scenarios (int | None, optional): Number of scenarios kept, None for all.
+            Defaults to None.
+
+    Returns:
+        dict[str, int]: Number of variables, constraints and nonzeros.
+    """
+    G, T = len(data.gen_names), data.T
+    S = len(data.scenario_weights) if uncertainty else 1
+    if n_scenarios is not None:
+        S = min(S, n_scenarios)
+    L, Z = len(data.line_names), len(data.zone_names)
+
+    n_nonzero_min = sum(
+        value != 0 for gen in data.gen_names for value in data.cf_data[gen]["min_cf"]
+    )
+    # gen_min rows with a zero capacity factor only contain the generation
+    n_min_rows = n_nonzero_min if lean else G * T
+    n_min_nonzeros = 2 * n_nonzero_min if lean else G * T + n_nonzero_min
+    n_balance = Z * T if Z else T
+    return {
+        "vars": 3 * G * T + 2 * L * T + S * (G * T + L * T),
+        "constrs": G * T + L * T + S * (n_balance + G * T + n_min_rows + 2 * L * T),
+        "nonzeros": (
+            4 * G * T - G + 3 * L * T - L + S * (3 * G * T + n_min_nonzeros + 6 * L * T)
+        ),
+    }
+
+
+def current_rss() -> float:
+    """Get the current resident set size.
+
+    Returns:
+        float: Resident set size in bytes.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return float(pages * os.sysconf("SC_PAGE_SIZE"))
+    except OSError:
+        return peak_rss()
+
+
+def peak_rss() -> float:
+    """Get the peak resident set size of this process.
+
+    Returns:
+        float: Peak resident set size in bytes.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return float(peak if sys.platform == "darwin" else peak * 1024)
+
+
+class MemoryEstimator:
+    """Estimate of the peak memory of a model solve.
+
+    The estimate is ``base + overhead + bytes_per_nonzero * nonzeros``, where
+    base is the RSS of an idle worker and overhead the fixed working memory of
+    the solver. Measured solves refine the base by exponential smoothing and
+    the other two terms by a least-squares fit over the recent solves.
+    """
+
+    def __init__(
+        self,
+        bytes_per_nonzero: float = BYTES_PER_NONZERO,
+        overhead: float = SOLVER_OVERHEAD,
+        base: float = BASE_BYTES,
+        observations: list[tuple[int, float]] | None = None,
+    ) -> None:
+        """Initialize instance.
+
+        Args:
+            bytes_per_nonzero (float, optional): Memory per nonzero in bytes.
+                Defaults to BYTES_PER_NONZERO.
+            overhead (float, optional): Fixed memory of a solve in bytes. Defaults
+                to SOLVER_OVERHEAD.
+            base (float, optional): Memory of an idle worker process in bytes.
+                Defaults to BASE_BYTES.
+            observations (list[tuple[int, float]] | None, optional): Nonzeros and
+                measured memory above the base of earlier solves. Defaults to None.
+        """
+        self.bytes_per_nonzero = bytes_per_nonzero
+        self.overhead = overhead
+        self.base = base
+        self.observations = observations or []
+
+    def estimate(self, dimensions: dict[str, int]) -> float:
+        """Estimate the peak memory of a solve.
+
+        Args:
+            dimensions (dict[str, int]): Dimensions from model_dimensions.
+
+        Returns:
+            float: Peak memory in bytes.
+        """
+        return (
+            self.base + self.overhead + self.bytes_per_nonzero * dimensions["nonzeros"]
+        )
+
+    def observe(self, dimensions: dict[str, int], base: float, peak: float) -> None:
+        """Refine the estimate with a measured solve.
+
+        Args:
+            dimensions (dict[str, int]): Dimensions of the solved model.
+            base (float): RSS of the worker before building the model in bytes.
+            peak (float): Peak RSS of the worker during build and solve in bytes.
+        """
+        self.base += SMOOTHING * (base - self.base)
+        self.observations = self.observations[-(MAX_OBSERVATIONS - 1) :] + [
+            (dimensions["nonzeros"], max(peak - base, 0.0))
+        ]
+
+        n = len(self.observations)
+        mean_x = sum(x for x, _ in self.observations) / n
+        mean_y = sum(y for _, y in self.observations) / n
+        variance = sum((x - mean_x) ** 2 for x, _ in self.observations)
+        if variance > 0:
+            slope = (
+                sum((x - mean_x) * (y - mean_y) for x, y in self.observations)
+                / variance
+            )
+            self.bytes_per_nonzero = max(slope, 0.0)
+        # Without spread in the sizes only the fixed part is refined
+        self.overhead = max(mean_y - self.bytes_per_nonzero * mean_x, 0.0)
+
+    def save(self, path: str | Path) -> None:
+        """Save the calibration for later runs.
+
+        Args:
+            path (str | Path): JSON file.
+        """
+        Path(path).write_text(json.dumps(self.__dict__))
+
+    @classmethod
+    def load(cls, path: str | Path) -> "MemoryEstimator":
+        """Load a saved calibration, or the defaults if there is none.
+
+        Args:
+            path (str | Path): JSON file.
+
+        Returns:
+            MemoryEstimator: Estimator with the saved calibration.
+        """
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        content = json.loads(path.read_text())
+        content["observations"] = [tuple(o) for o in content.get("observations", [])]
+        return cls(**content)
+
+
+def _solve_measured(
+    job: Job, point: dict[str, float], overrides: dict[str, bool | int]
+) -> tuple[dict[str, float], float, float]:
+    """Solve a sweep point and measure the memory of the worker.
+
+    Module level function so that it can be run in worker processes. Every
+    worker solves a single point, so its peak RSS belongs to this solve.
+
+    Args:
+        job (Job): Sweep job.
+        point (dict[str, float]): Parameter values of the point.
+        overrides (dict[str, bool | int]): Options replacing the job options.
+
+    Returns:
+        tuple[dict[str, float], float, float]: Result of the point, RSS before
+            the build and peak RSS in bytes.
+    """
+    from assignment_2.utils.gurobi_env import get_default_env
+
+    # Start the environment first so that the base includes the solver library
+    get_default_env()
+    model = job.create_model()
+    base = current_rss()
+    try:
+        result = job.solve_point(model, point, overrides)
+    finally:
+        model.dispose()
+    return result, base, peak_rss()
+
+
+class MemoryBudgetRunner:
+    """Solve sweep points in worker processes within a memory budget."""
+
+    def __init__(
+        self,
+        job: Job,
+        budget: float,
+        max_workers: int = 1,
+        estimator: MemoryEstimator | None = None,
+    ) -> None:
+        """Initialize instance.
+
+        Args:
+            job (Job): Sweep job.
+            budget (float): Memory available to all workers together in bytes.
+            max_workers (int, optional): Maximum number of concurrent solves.
+                Defaults to 1.
+            estimator (MemoryEstimator | None, optional): Memory estimator, refined
+                by the solves. Defaults to None, i.e. the default calibration.
+        """
+        self.job = job
+        self.budget = budget
+        self.max_workers = max_workers
+        self.estimator = estimator or MemoryEstimator()
+
+    def _candidates(self, data: DataModel) -> Iterator[dict[str, bool | int]]:
+        """Get the options of a point from full size to most downsized.
+
+        Args:
+            data (DataModel): Data of the point.
+
+        Yields:
+            dict[str, bool | int]: Options replacing the job options.
+        """
+        yield {}
+        yield {"lean": True}
+        if self.job.model == "UncertaintyModel":
+            n_scenarios = len(data.scenario_weights) // 2
+            while n_scenarios >= 1:
+                yield {"lean": True, "n_scenarios": n_scenarios}
+                n_scenarios //= 2
+
+    def admit(
+        self, point: dict[str, float]
+    ) -> tuple[dict[str, bool | int], dict[str, int]] | None:
+        """Choose the largest version of a point that fits in the budget.
+
+        Args:
+            point (dict[str, float]): Parameter values of the point.
+
+        Returns:
+            tuple[dict[str, bool | int], dict[str, int]] | None: Options replacing
+                the job options and dimensions of the model, None if even the
+                smallest version does not fit.
+        """
+        data, _ = self.job.point_data(point)
+        if not isinstance(data, DataModel):
+            # The LCOEModel has one variable per generator
+            return {}, {"vars": 0, "constrs": 0, "nonzeros": 0}
+
+        for overrides in self._candidates(data):
+            dimensions = model_dimensions(
+                data,
+                uncertainty=self.job.model == "UncertaintyModel",
+                lean=bool(overrides.get("lean", self.job.options.get("lean", False))),
+                n_scenarios=overrides.get("n_scenarios"),
+            )
+            if self.estimator.estimate(dimensions) <= self.budget:
+                return overrides, dimensions
+        return None
+
+    def run(
+        self, points: list[tuple[str, dict[str, float]]]
+    ) -> Iterator[tuple[str, dict[str, float] | None]]:
+        """Solve points, starting each one once its estimate fits in the budget.
+
+        Args:
+            points (list[tuple[str, dict[str, float]]]): Identifier and parameter
+                values of every point.
+
+        Yields:
+            tuple[str, dict[str, float] | None]: Identifier and result of every
+                point in order of completion. The ``n_scenarios`` and ``lean``
+                columns of a result record how far the point was downsized.
+                The result is None for points that do not fit in the budget at
+                all.
+        """
+        pending = list(points)
+        running: dict[Future, tuple[str, dict[str, int], float]] = {}
+        in_use = 0.0
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers, max_tasks_per_child=1
+        ) as pool:
+            while pending or running:
+                while pending and len(running) < self.max_workers:
+                    point_id, point = pending[0]
+                    admitted = self.admit(point)
+                    if admitted is None:
+                        pending.pop(0)
+                        logger.warning(
+                            "Point %s exceeds the memory budget and is skipped.",
+                            point_id,
+                        )
+                        yield point_id, None
+                        continue
+
+                    overrides, dimensions = admitted
+                    estimate = self.estimator.estimate(dimensions)
+                    if running and in_use + estimate > self.budget:
+                        # Delay until running solves release memory
+                        break
+                    pending.pop(0)
+                    if overrides:
+                        logger.info("Point %s downsized to %s.", point_id, overrides)
+                    future = pool.submit(_solve_measured, self.job, point, overrides)
+                    running[future] = (point_id, dimensions, estimate)
+                    in_use += estimate
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    point_id, dimensions, estimate = running.pop(future)
+                    in_use -= estimate
+                    result, base, peak = future.result()
+                    self.estimator.observe(dimensions, base, peak)
+                    yield point_id, result
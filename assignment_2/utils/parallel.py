@@ -0,0 +1,36 @@
+"""Warm-started sequences of solves split over worker processes."""
+
+import math
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+
+
+def map_blocks(
+    function: Callable[..., list],
+    items: list,
+    max_workers: int,
+    *args: object,
+) -> list:
+    """Solve contiguous blocks of items in worker processes.
+
+    Contiguous blocks keep neighbouring items on the same warm-started model.
+    Every block is solved by one call ``function(*args, block)`` in a worker
+    process, so the function must be defined at module level and return one
+    result per item of the block.
+
+    Args:
+        function (Callable[..., list]): Function solving a block of items.
+        items (list): Items to solve, best given in order.
+        max_workers (int): Number of worker processes.
+        *args (object): Leading arguments of every call, e.g. the data or the
+            path of a saved model.
+
+    Returns:
+        list: Results of all items in the order of the items.
+    """
+    n_blocks = min(max_workers, len(items))
+    size = math.ceil(len(items) / n_blocks)
+    blocks = [items[i : i + size] for i in range(0, len(items), size)]
+    with ProcessPoolExecutor(max_workers=n_blocks) as pool:
+        results = pool.map(function, *[[arg] * len(blocks) for arg in args], blocks)
+        return [result for block in results for result in block]
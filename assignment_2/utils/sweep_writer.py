@@ -0,0 +1,246 @@
+"""Checkpointed storage for parameter sweep results.
+
+Results are appended to chunked ``.npz`` files as sweep points finish. A
+manifest records which points every chunk holds, so an interrupted sweep can be
+resumed and partial results can be read while the sweep is still running. It
+also records the parameters of the run, and resuming with other parameters is
+refused instead of mixing stale points into the results.
+"""
+
+import hashlib
+import json
+import os
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO
+
+import numpy as np
+
+MANIFEST_NAME = "manifest.json"
+
+
+def _read_manifest(directory: Path) -> dict:
+    """Read the manifest of a sweep directory.
+
+    Args:
+        directory (Path): Sweep directory.
+
+    Returns:
+        dict: Manifest content. Empty manifest if none has been written yet.
+    """
+    path = directory / MANIFEST_NAME
+    if not path.exists():
+        return {"columns": [], "chunks": [], "metadata": None}
+    with path.open() as f:
+        return {"metadata": None, **json.load(f)}
+
+
+def fingerprint(value: object) -> str:
+    """Get a hash of the attributes of an object, e.g. of the sweep data.
+
+    Args:
+        value (object): Object with JSON serializable attributes.
+
+    Returns:
+        str: SHA-256 hex digest of the attributes.
+    """
+    content = json.dumps(vars(value), sort_keys=True, default=str)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def _atomic_write_bytes(path: Path, write: Callable[[BinaryIO], object]) -> None:
+    """Write a file through a temporary file and an atomic rename.
+
+    Args:
+        path (Path): Destination file.
+        write (Callable[[BinaryIO], object]): Writes the content to the open file.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("wb") as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class SweepWriter:
+    """Append sweep results to a directory of ``.npz`` chunks.
+
+    Each point is a mapping from column name to float. Points are buffered and
+    written as one chunk every ``chunk_size`` points, after which the manifest
+    is updated. Points already listed in the manifest are reported as done so
+    the sweep loop can skip them when resuming.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        chunk_size: int = 1,
+        metadata: dict[str, object] | None = None,
+    ) -> None:
+        """Initialize instance.
+
+        Args:
+            directory (str | Path): Directory holding chunks and the manifest.
+                Created if it does not exist.
+            chunk_size (int, optional): Number of points per chunk. Defaults to 1,
+                which checkpoints after every point.
+            metadata (dict[str, object] | None, optional): JSON serializable
+                parameters of the run, e.g. the discount factor and a fingerprint
+                of the data. Stored in the manifest, and resuming a sweep written
+                with other metadata raises an exception. Defaults to None, i.e.
+                not checked.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.chunk_size = chunk_size
+        self.manifest = _read_manifest(self.directory)
+        if metadata is not None:
+            # Compare in the form read back from the manifest
+            metadata = json.loads(json.dumps(metadata))
+            if not self.manifest["chunks"]:
+                self.manifest["metadata"] = metadata
+            elif self.manifest["metadata"] != metadata:
+                raise Exception(
+                    f"Sweep in {self.directory} was run with "
+                    f"{self.manifest['metadata']}, not {metadata}. Remove it or "
+                    "choose another directory."
+                )
+        self.completed: set[str] = {
+            point_id
+            for chunk in self.manifest["chunks"]
+            for point_id in chunk["points"]
+        }
+        self.buffer: list[tuple[str, dict[str, float]]] = []
+
+    def __enter__(self) -> "SweepWriter":
+        """Enter context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Flush buffered points when leaving the context manager."""
+        self.close()
+
+    def is_done(self, point_id: str) -> bool:
+        """Check whether a point has already been written.
+
+        Args:
+            point_id (str): Identifier of the sweep point.
+
+        Returns:
+            bool: True if the point is stored or buffered.
+        """
+        return point_id in self.completed
+
+    def write(self, point_id: str, values: dict[str, float]) -> None:
+        """Add the results of a finished sweep point.
+
+        Args:
+            point_id (str): Unique identifier of the sweep point.
+            values (dict[str, float]): Results of the point by column name.
+        """
+        columns = list(values)
+        if not self.manifest["columns"]:
+            self.manifest["columns"] = columns
+        elif set(columns) != set(self.manifest["columns"]):
+            raise Exception(
+                f"Columns {columns} do not match sweep columns "
+                f"{self.manifest['columns']}."
+            )
+
+        self.buffer.append((point_id, values))
+        self.completed.add(point_id)
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered points as a new chunk and update the manifest."""
+        if not self.buffer:
+            return
+
+        file_name = f"chunk_{len(self.manifest['chunks']):05d}.npz"
+        arrays = {
+            column: np.array([values[column] for _, values in self.buffer])
+            for column in self.manifest["columns"]
+        }
+        arrays["point_id"] = np.array([point_id for point_id, _ in self.buffer])
+        _atomic_write_bytes(self.directory / file_name, lambda f: np.savez(f, **arrays))
+
+        self.manifest["chunks"].append(
+            {"file": file_name, "points": [point_id for point_id, _ in self.buffer]}
+        )
+        manifest = json.dumps(self.manifest, indent=1).encode()
+        _atomic_write_bytes(self.directory / MANIFEST_NAME, lambda f: f.write(manifest))
+        self.buffer = []
+
+    def close(self) -> None:
+        """Flush remaining buffered points."""
+        self.flush()
+
+
+class SweepReader:
+    """Lazy reader for a sweep directory written by ``SweepWriter``.
+
+    Only chunks listed in the manifest at construction are read, so a reader
+    can be used on a sweep that is still running.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        """Initialize instance.
+
+        Args:
+            directory (str | Path): Sweep directory.
+        """
+        self.directory = Path(directory)
+        self.manifest = _read_manifest(self.directory)
+        self.columns: list[str] = self.manifest["columns"]
+        self.point_ids: list[str] = [
+            point_id
+            for chunk in self.manifest["chunks"]
+            for point_id in chunk["points"]
+        ]
+
+    def __len__(self) -> int:
+        """Number of stored points."""
+        return len(self.point_ids)
+
+    def iter_chunks(self) -> Iterator[dict[str, np.ndarray]]:
+        """Iterate over chunks, loading one chunk at a time.
+
+        Yields:
+            dict[str, np.ndarray]: Columns of the chunk including ``point_id``.
+        """
+        for chunk in self.manifest["chunks"]:
+            with np.load(self.directory / chunk["file"]) as npz:
+                yield {key: npz[key] for key in npz.files}
+
+    def column(self, name: str) -> np.ndarray:
+        """Read a single column without loading the other columns.
+
+        Args:
+            name (str): Column name, or ``point_id``.
+
+        Returns:
+            np.ndarray: Values of the column over all stored points.
+        """
+        values = []
+        for chunk in self.manifest["chunks"]:
+            with np.load(self.directory / chunk["file"]) as npz:
+                values.append(npz[name])
+        if not values:
+            return np.array([])
+        return np.concatenate(values)
+
+    def load(self) -> dict[str, np.ndarray]:
+        """Read all stored points.
+
+        Returns:
+            dict[str, np.ndarray]: Values of every column including ``point_id``.
+        """
+        return {name: self.column(name) for name in [*self.columns, "point_id"]}
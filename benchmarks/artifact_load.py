@@ -0,0 +1,55 @@
+"""Benchmark of loading a compiled model against building it from the data.
+
+Compiles the UncertaintyModel of the Jonas case once, then compares the time
+to build the model from the data with the time to load the artifact, as a
+worker would before solving its first point.
+
+Usage:
+    python benchmarks/artifact_load.py [--scenarios 15] [--repeats 5]
+"""
+
+import argparse
+import copy
+import tempfile
+import time
+
+from assignment_2.model2 import DataModel
+from assignment_2.model2.artifact import ModelArtifact, compile_model
+from assignment_2.model3 import UncertaintyModel
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", type=int, default=15)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    data = DataModel()
+    data.jonas()
+    data = data.reduce_scenarios(args.scenarios)
+
+    build_time = 0.0
+    for _ in range(args.repeats):
+        with UncertaintyModel() as model:
+            start = time.perf_counter()
+            model.define_uncertainty_model(
+                data=copy.deepcopy(data), discount_factor=0.05
+            )
+            build_time += time.perf_counter() - start
+    print(f"build from data   {build_time / args.repeats:8.4f} s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        compile_model(data, directory, discount_factor=0.05, uncertainty=True)
+        print(f"compile once      {time.perf_counter() - start:8.4f} s")
+
+        load_time = 0.0
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            with ModelArtifact(directory):
+                load_time += time.perf_counter() - start
+        print(f"load artifact     {load_time / args.repeats:8.4f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Benchmark of the expected-cost objective against one objective per scenario.
+
+Builds and solves the UncertaintyModel of the Jonas case with one blended
+expected-cost objective and with a weighted objective per scenario, and
+compares build time, solve time and optimum.
+
+Usage:
+    python benchmarks/blended_objective.py [--scenarios 15] [--repeats 5]
+"""
+
+import argparse
+import copy
+import time
+
+from assignment_2.model2 import DataModel
+from assignment_2.model3 import UncertaintyModel
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", type=int, default=15)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    data = DataModel()
+    data.jonas()
+    data = data.reduce_scenarios(args.scenarios)
+
+    for multi_objective in [False, True]:
+        build_time = solve_time = 0.0
+        for _ in range(args.repeats):
+            with UncertaintyModel() as model:
+                start = time.perf_counter()
+                model.define_uncertainty_model(
+                    data=copy.deepcopy(data),
+                    discount_factor=0.05,
+                    multi_objective=multi_objective,
+                )
+                built = time.perf_counter()
+                model.optimize()
+                solved = time.perf_counter()
+                _, objective = model.get_results()
+            build_time += built - start
+            solve_time += solved - built
+        label = "per scenario" if multi_objective else "blended"
+        print(
+            f"{label:<12} build {build_time / args.repeats:8.4f} s, "
+            f"solve {solve_time / args.repeats:8.4f} s, objective {objective:.10e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark of extending a solved model against a cold rebuild.
+
+Solves the UncertaintyModel of the Jonas case over the first years, extends
+it by the remaining years, and compares the time of the extension and
+re-solve with building and solving the full horizon from scratch.
+
+Usage:
+    python benchmarks/extend_horizon.py [--years 16] [--scenarios 15]
+"""
+
+import argparse
+import copy
+import time
+
+from assignment_2.model2 import DataModel
+from assignment_2.model3 import UncertaintyModel
+
+
+def jonas(n_years: int, n_scenarios: int) -> DataModel:
+    """Create the Jonas case over the first years and scenarios.
+
+    Args:
+        n_years (int): Number of periods.
+        n_scenarios (int): Number of scenarios.
+
+    Returns:
+        DataModel: Truncated Jonas data.
+    """
+    data = DataModel()
+    data.jonas()
+    data = data.reduce_scenarios(n_scenarios)
+    truncated = copy.deepcopy(data)
+    truncated.add_load_series(data.load_series[:n_years])
+    for gen in data.gen_names:
+        for key in ["max_cf", "min_cf"]:
+            truncated.cf_data[gen][key] = data.cf_data[gen][key][:n_years]
+    return truncated
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, default=16)
+    parser.add_argument("--scenarios", type=int, default=15)
+    args = parser.parse_args()
+    full = jonas(21, args.scenarios)
+
+    with UncertaintyModel() as model:
+        start = time.perf_counter()
+        model.define_uncertainty_model(data=copy.deepcopy(full), discount_factor=0.05)
+        built = time.perf_counter()
+        model.optimize()
+        solved = time.perf_counter()
+        _, cold_objective = model.get_results()
+        print(
+            f"cold build {built - start:8.3f} s, solve {solved - built:8.3f} s, "
+            f"{model.model.IterCount:6.0f} iterations, objective {cold_objective:.6e}"
+        )
+
+    with UncertaintyModel() as model:
+        model.define_uncertainty_model(
+            data=jonas(args.years, args.scenarios), discount_factor=0.05
+        )
+        model.optimize()
+        start = time.perf_counter()
+        model.extend_uncertainty_model(copy.deepcopy(full))
+        built = time.perf_counter()
+        model.optimize()
+        solved = time.perf_counter()
+        _, objective = model.get_results()
+        print(
+            f"extension  {built - start:8.3f} s, solve {solved - built:8.3f} s, "
+            f"{model.model.IterCount:6.0f} iterations, objective {objective:.6e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
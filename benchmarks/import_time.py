@@ -0,0 +1,81 @@
+"""Benchmark of package import time.
+
+Every import is timed in a fresh interpreter, as a short-lived sweep worker
+or CLI invocation would pay it. The heavy dependencies loaded by each import
+are reported next to the timing.
+
+Usage:
+    python benchmarks/import_time.py [--repeats N]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ["gurobipy", "numpy", "matplotlib", "scipy"]
+
+STATEMENTS = [
+    "pass",
+    "import assignment_2.model1",
+    "import assignment_2.model2",
+    "import assignment_2.model3",
+    "from assignment_2.model2 import DataModel",
+    "from assignment_2.model2 import IntertemporalExpansionModel",
+    "from assignment_2.model3 import UncertaintyModel",
+    "import gurobipy",
+    "import matplotlib.pyplot",
+]
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(elapsed, ",".join(heavy))
+"""
+
+
+def time_statement(statement: str, repeats: int) -> tuple[float, str]:
+    """Time a statement in fresh interpreters.
+
+    Args:
+        statement (str): Python statement to execute.
+        repeats (int): Number of interpreters to start.
+
+    Returns:
+        tuple[float, str]: Median time in seconds and loaded heavy modules.
+    """
+    times = []
+    heavy = ""
+    for _ in range(repeats):
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                _PROBE.format(statement=statement, heavy=HEAVY_MODULES),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.split()
+        times.append(float(output[0]))
+        heavy = output[1] if len(output) > 1 else ""
+    return statistics.median(times), heavy
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'statement':<60} {'time [ms]':>10}  heavy modules loaded")
+    for statement in STATEMENTS:
+        elapsed, heavy = time_statement(statement, args.repeats)
+        print(f"{statement:<60} {elapsed * 1000:>10.1f}  {heavy or '-'}")
+
+
+if __name__ == "__main__":
+    main()
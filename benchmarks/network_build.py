@@ -0,0 +1,89 @@
+"""Benchmark of the build time of multi-zone expansion models.
+
+Builds the Jonas case split over a growing number of zones, each with its
+own set of generators and connected by a ring of transmission lines plus
+random cross links, and reports the build time and model size. The models
+are only built, not solved.
+
+Usage:
+    python benchmarks/network_build.py [--zones 5 10 20 40] [--links-per-zone 2]
+"""
+
+import argparse
+import random
+import time
+
+from assignment_2.model2 import DataModel, IntertemporalExpansionModel
+
+
+def zonal_data(n_zones: int, links_per_zone: int, seed: int = 0) -> DataModel:
+    """Create the Jonas case split over zones.
+
+    Args:
+        n_zones (int): Number of zones.
+        links_per_zone (int): Number of lines per zone, including the ring.
+        seed (int, optional): Seed for the random cross links. Defaults to 0.
+
+    Returns:
+        DataModel: Data with zones, generators in every zone and lines.
+    """
+    jonas = DataModel()
+    jonas.jonas()
+
+    data = DataModel()
+    data.add_load_series(jonas.load_series)
+    data.add_co2_price(jonas.co2_price)
+    for z in range(n_zones):
+        zone = f"Z{z}"
+        data.add_zone(zone, load_share=1 / n_zones)
+        for gen in jonas.gen_names:
+            data.add_generator(
+                gen_name=f"{gen} {zone}",
+                **{
+                    key: value / n_zones if key == "initial_capacity" else value
+                    for key, value in jonas.gen_data[gen].items()
+                },
+                max_cf=jonas.cf_data[gen]["max_cf"],
+                min_cf=jonas.cf_data[gen]["min_cf"],
+                zone=zone,
+            )
+
+    rng = random.Random(seed)
+    n_lines = max(n_zones * links_per_zone // 2, n_zones)
+    for i in range(n_lines):
+        if i < n_zones:
+            ends = (i, (i + 1) % n_zones)
+        else:
+            ends = tuple(rng.sample(range(n_zones), 2))
+        data.add_line(
+            f"L{i}",
+            from_zone=f"Z{ends[0]}",
+            to_zone=f"Z{ends[1]}",
+            capex=1_000_000,
+            initial_capacity=max(jonas.load_series) / n_zones,
+        )
+    return data
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--zones", type=int, nargs="+", default=[5, 10, 20, 40])
+    parser.add_argument("--links-per-zone", type=int, default=2)
+    args = parser.parse_args()
+
+    print(f"{'zones':>6} {'lines':>6} {'vars':>8} {'constrs':>8} {'build [s]':>10}")
+    with IntertemporalExpansionModel() as model:
+        for n_zones in args.zones:
+            data = zonal_data(n_zones, args.links_per_zone)
+            start = time.perf_counter()
+            model.define_model(data=data, discount_factor=0.05)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{n_zones:>6} {len(data.line_names):>6} {model.model.NumVars:>8} "
+                f"{model.model.NumConstrs:>8} {elapsed:>10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
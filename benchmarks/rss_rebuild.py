@@ -0,0 +1,63 @@
+"""Benchmark of memory use over repeated model rebuilds.
+
+Rebuilds and solves the Jonas case many times, as a sweep does, and reports
+the resident set size. Exits with status 1 if the RSS grows by more than the
+tolerance after the warm-up rebuilds.
+
+Usage:
+    python benchmarks/rss_rebuild.py [--rebuilds N] [--tolerance-mb MB] [--pool]
+"""
+
+import argparse
+import sys
+
+from assignment_2.model2 import DataModel, IntertemporalExpansionModel
+from assignment_2.utils.gurobi_env import EnvPool
+from assignment_2.utils.memory import current_rss
+
+
+def rss_mb() -> float:
+    """Get the current resident set size.
+
+    Returns:
+        float: Resident set size in MB.
+    """
+    return current_rss() / 1024**2
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rebuilds", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--tolerance-mb", type=float, default=20.0)
+    parser.add_argument(
+        "--pool", action="store_true", help="Take the environment from an EnvPool."
+    )
+    args = parser.parse_args()
+
+    data = DataModel()
+    data.jonas()
+    pool = EnvPool() if args.pool else None
+    model = IntertemporalExpansionModel(env=pool)
+
+    baseline = 0.0
+    for i in range(1, args.rebuilds + 1):
+        model.define_model(data=data, discount_factor=0.05)
+        model.optimize()
+        if i == args.warmup:
+            baseline = rss_mb()
+        if i % max(args.rebuilds // 10, 1) == 0:
+            print(f"rebuild {i:>6}: RSS {rss_mb():8.1f} MB")
+    model.dispose()
+    if pool is not None:
+        pool.close()
+
+    growth = rss_mb() - baseline
+    print(f"RSS growth after warm-up: {growth:.1f} MB")
+    if growth > args.tolerance_mb:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
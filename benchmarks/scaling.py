@@ -0,0 +1,46 @@
+"""Benchmark of the numerical scaling of the expansion models.
+
+Solves the Jonas case with and without scaling and reports simplex
+iterations, solve time and objective value. The coefficient ranges before
+and after scaling are logged.
+
+Usage:
+    python benchmarks/scaling.py [--uncertainty]
+"""
+
+import argparse
+import logging
+
+from assignment_2.model2 import DataModel, IntertemporalExpansionModel
+from assignment_2.model3 import UncertaintyModel
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--uncertainty", action="store_true", help="Benchmark the UncertaintyModel."
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    print(f"{'scaled':<8} {'iterations':>10} {'runtime [s]':>12} {'objective':>14}")
+    for scale in [False, True]:
+        data = DataModel()
+        data.jonas()
+        if args.uncertainty:
+            model = UncertaintyModel()
+            model.define_uncertainty_model(data=data, discount_factor=0.05, scale=scale)
+        else:
+            model = IntertemporalExpansionModel()
+            model.define_model(data=data, discount_factor=0.05, scale=scale)
+        model.optimize()
+        _, obj_val = model.get_results()
+        print(
+            f"{scale!s:<8} {model.model.IterCount:>10.0f} "
+            f"{model.model.Runtime:>12.4f} {obj_val:>14.6e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
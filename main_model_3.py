@@ -7,6 +7,7 @@ from tqdm import tqdm
 
 from assignment_2.model2 import DataModel
 from assignment_2.model3 import UncertaintyModel
+from assignment_2.utils import SweepReader, SweepWriter, fingerprint
 
 model = UncertaintyModel()
 data = DataModel()
@@ -20,25 +21,39 @@ model.plot_results(scale_factor=365 * 24)
 
 
 scales = np.arange(0, 2, 0.01)
-capacities: dict[str, list[float]] = {}
-for conv_factor in tqdm(scales):
-    data.jonas_max_capacity_change(conv_max_factor=float(conv_factor))
-    model.define_uncertainty_model(data=data, discount_factor=0.05)
-    model.optimize()
-    results, obj_val = model.get_results()
-    for gen in model.gen_names:
-        if gen not in capacities:
-            capacities[gen] = []
-        capacities[gen].append(
-            results["capacities"][gen][-1] / (365 * 24)
-        )  # final time step
+# Points of an earlier run are only reused if it had the same parameters
+metadata = {"discount_factor": 0.05, "data": fingerprint(data)}
+with SweepWriter("results/model3_conv_sweep", metadata=metadata) as writer:
+    for conv_factor in tqdm(scales):
+        point_id = f"{conv_factor:.2f}"
+        if writer.is_done(point_id):
+            continue
+        data.jonas_max_capacity_change(conv_max_factor=float(conv_factor))
+        model.define_uncertainty_model(data=data, discount_factor=0.05)
+        model.optimize()
+        results, obj_val = model.get_results()
+        writer.write(
+            point_id,
+            {
+                "conv_factor": float(conv_factor),
+                **{
+                    gen: results["capacities"][gen][-1] / (365 * 24)  # final time step
+                    for gen in model.gen_names
+                },
+            },
+        )
+
+sweep = SweepReader("results/model3_conv_sweep").load()
+order = np.argsort(sweep["conv_factor"])
+scales = sweep["conv_factor"][order]
+capacities = {gen: sweep[gen][order] for gen in model.gen_names}
 
 fig, ax = plt.subplots(figsize=(10, 5), constrained_layout=True)
 
 # Use a consistent, colorblind-friendly palette; fall back to model.colors if present
 gen_order = sorted(
     capacities.keys(),
-    key=lambda g: capacities[g][-1] if capacities[g] else 0,
+    key=lambda g: capacities[g][-1] if len(capacities[g]) else 0,
     reverse=True,
 )
 
@@ -0,0 +1,85 @@
+"""Tests of solving sweep points on compiled model artifacts."""
+
+from pathlib import Path
+
+import pytest
+
+from assignment_2.model2.artifact import ModelArtifact
+from assignment_2.utils.job import Job
+
+# Three years of the Jonas case without offshore wind, with three scenarios
+DATASET = """
+load_series = [36e6, 37.1e6, 38.2e6]
+co2_price = 32.6
+
+[generators."Onshore Wind"]
+capex = 20071788000
+fixed_opex = 144540000
+var_opex = 1.98
+decex = 756864000
+initial_capacity = 42118080
+max_cf = 0.25
+
+[generators."Solar PV"]
+capex = 9373200000
+fixed_opex = 1664400000
+decex = 378432000
+initial_capacity = 30914040
+max_cf = 0.12
+
+[generators.Coal]
+capex = 18424032000
+fixed_opex = 300906000
+var_opex = 3.21
+initial_capacity = 19193160
+co2 = 0.84
+
+[generators."Natural Gas"]
+capex = 16767253200
+fixed_opex = 86636400
+var_opex = 5.4
+initial_capacity = 14944560
+co2 = 0.37
+
+[[scenarios]]
+weight = 0.25
+load_factor = 0.95
+cf = { "Onshore Wind" = 0.35 }
+
+[[scenarios]]
+weight = 0.5
+load_factor = 1.0
+cf = { "Onshore Wind" = 0.25 }
+
+[[scenarios]]
+weight = 0.25
+load_factor = 1.05
+cf = { "Onshore Wind" = 0.2 }
+"""
+
+
+@pytest.mark.parametrize("model", ["IntertemporalExpansionModel", "UncertaintyModel"])
+def test_artifact_points_match_rebuild(tmp_path: Path, model: str) -> None:
+    """Points solved on a compiled model equal points solved on a rebuild."""
+    dataset = tmp_path / "dataset.toml"
+    dataset.write_text(DATASET)
+    job = Job(
+        dataset=str(dataset),
+        model=model,
+        output=tmp_path / "results",
+        discount_factor=0.05,
+        sweep={
+            "conv_max_factor": [0.5, 1.0, 2.0],
+            "co2_price": [0.0, 150.0],
+            "load_factor": [1.0, 1.2],
+        },
+    )
+    directory = job.compile_artifact(tmp_path / "artifact")
+
+    with ModelArtifact(directory) as artifact, job.create_model() as rebuilt:
+        for point in job.points():
+            expected = job.solve_point(rebuilt, point)
+            result = job.solve_artifact_point(artifact, point)
+            assert result.keys() == expected.keys()
+            for column, value in expected.items():
+                assert result[column] == pytest.approx(value, rel=1e-6, abs=1e-3)
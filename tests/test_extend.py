@@ -0,0 +1,68 @@
+"""Tests of extending built models by periods and generators."""
+
+import pytest
+
+from assignment_2.model2 import DataModel, IntertemporalExpansionModel
+from assignment_2.model3 import UncertaintyModel
+
+
+def jonas(n_periods: int, n_gens: int = 5, n_scenarios: int = 3) -> DataModel:
+    """Create the Jonas case over the first periods, generators and scenarios.
+
+    Args:
+        n_periods (int): Number of periods.
+        n_gens (int, optional): Number of generators. Defaults to 5.
+        n_scenarios (int, optional): Number of scenarios. Defaults to 3.
+
+    Returns:
+        DataModel: Truncated Jonas data.
+    """
+    data = DataModel()
+    data.jonas()
+    data = data.reduce_scenarios(n_scenarios)
+    data.add_load_series(data.load_series[:n_periods])
+    for gen in data.gen_names[n_gens:]:
+        del data.gen_data[gen], data.cf_data[gen], data.colors[gen]
+    data.gen_names = data.gen_names[:n_gens]
+    for gen in data.gen_names:
+        for key in ["max_cf", "min_cf"]:
+            data.cf_data[gen][key] = data.cf_data[gen][key][:n_periods]
+    return data
+
+
+def assert_same_model(
+    model: IntertemporalExpansionModel, cold: IntertemporalExpansionModel
+) -> None:
+    """Check that an extended model matches a cold build after solving both.
+
+    Args:
+        model (IntertemporalExpansionModel): Extended model.
+        cold (IntertemporalExpansionModel): Model built from scratch.
+    """
+    model.optimize()
+    cold.optimize()
+    assert model.gen_names == cold.gen_names
+    assert model.T == cold.T
+    assert model.model.NumVars == cold.model.NumVars
+    assert model.model.NumConstrs == cold.model.NumConstrs
+    assert model.get_results()[1] == pytest.approx(cold.get_results()[1], rel=1e-9)
+
+
+def test_extend_matches_cold_build() -> None:
+    """Appending periods and generators gives the model of a cold build."""
+    with IntertemporalExpansionModel() as model, IntertemporalExpansionModel() as cold:
+        model.define_model(data=jonas(4, n_gens=4), discount_factor=0.05)
+        model.optimize()
+        model.extend(jonas(6))
+        cold.define_model(data=jonas(6), discount_factor=0.05)
+        assert_same_model(model, cold)
+
+
+def test_extend_uncertainty_model_matches_cold_build() -> None:
+    """Appending periods and generators to every scenario matches a cold build."""
+    with UncertaintyModel() as model, UncertaintyModel() as cold:
+        model.define_uncertainty_model(data=jonas(4, n_gens=4), discount_factor=0.05)
+        model.optimize()
+        model.extend_uncertainty_model(jonas(6))
+        cold.define_uncertainty_model(data=jonas(6), discount_factor=0.05)
+        assert_same_model(model, cold)
@@ -0,0 +1,105 @@
+"""Tests of the shared Gurobi environments and model disposal."""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from gurobipy import GurobiError
+
+from assignment_2.model2 import DataModel, IntertemporalExpansionModel
+from assignment_2.utils.gurobi_env import EnvPool, get_default_env
+from assignment_2.utils.memory import peak_rss
+
+# Rebuilds before the peak RSS is taken as baseline
+WARMUP = 20
+REBUILDS = 200
+# Allowed growth of the peak RSS after the warm-up
+TOLERANCE = 20 * 1024**2
+
+
+@pytest.mark.parametrize("pooled", [False, True])
+def test_rss_flat_over_rebuilds(pooled: bool) -> None:
+    """Repeated rebuilds and solves do not grow the peak RSS."""
+    data = DataModel()
+    data.jonas()
+    pool = EnvPool() if pooled else None
+
+    with IntertemporalExpansionModel(env=pool) as model:
+        for _ in range(WARMUP):
+            model.define_model(data=data, discount_factor=0.05)
+            model.optimize()
+        baseline = peak_rss()
+        for _ in range(REBUILDS):
+            model.define_model(data=data, discount_factor=0.05)
+            model.optimize()
+        growth = peak_rss() - baseline
+    if pool is not None:
+        pool.close()
+
+    assert growth < TOLERANCE
+
+
+def test_rebuild_disposes_previous_model() -> None:
+    """Rebuilding frees the previous Gurobi model."""
+    data = DataModel()
+    data.jonas()
+    with IntertemporalExpansionModel() as model:
+        model.define_model(data=data, discount_factor=0.05)
+        previous = model.model
+        model.define_model(data=data, discount_factor=0.05)
+        with pytest.raises(GurobiError):
+            previous.NumVars  # noqa: B018
+    with pytest.raises(AttributeError):
+        model.model  # noqa: B018
+
+
+def test_pool_reuses_released_environment() -> None:
+    """A disposed model returns its environment to the pool."""
+    data = DataModel()
+    data.jonas()
+    with EnvPool(size=1) as pool:
+        with IntertemporalExpansionModel(env=pool) as model:
+            model.define_model(data=data)
+            env = model.env
+        with IntertemporalExpansionModel(env=pool) as model:
+            model.define_model(data=data)
+            assert model.env is env
+        assert len(pool.envs) == 1
+
+
+def _solve_in_child(parent_env: int) -> tuple[bool, float]:
+    """Solve the Jonas case in a worker process.
+
+    Args:
+        parent_env (int): Identity of the shared environment of the parent.
+
+    Returns:
+        tuple[bool, float]: Whether the child uses its own environment, and
+            the objective value.
+    """
+    data = DataModel()
+    data.jonas()
+    with IntertemporalExpansionModel() as model:
+        model.define_model(data=data, discount_factor=0.05)
+        model.optimize()
+        return id(model.env) != parent_env, model.get_results()[1]
+
+
+def test_forked_child_creates_own_environment() -> None:
+    """A forked worker does not reuse the shared environment of its parent."""
+    data = DataModel()
+    data.jonas()
+    with IntertemporalExpansionModel() as model:
+        model.define_model(data=data, discount_factor=0.05)
+        model.optimize()
+        _, obj_val = model.get_results()
+    parent_env = get_default_env()
+
+    with ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context("fork")
+    ) as pool:
+        own_env, child_obj_val = pool.submit(_solve_in_child, id(parent_env)).result()
+
+    assert own_env
+    assert child_obj_val == pytest.approx(obj_val)
+    assert get_default_env() is parent_env